@@ -10,6 +10,7 @@ import os
 import sys
 import argparse
 import concurrent.futures
+import zipfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -41,6 +42,11 @@ def ingest_zip(args):
     if not zip_path.exists():
         print(f"[ERROR] ZIP file not found at {zip_path}")
         return
+    # Cheap check (reads the central directory) before building the worker;
+    # extracted export directories are passed through as-is
+    if zip_path.is_file() and not zipfile.is_zipfile(zip_path):
+        print(f"[ERROR] Not a valid ZIP file: {zip_path}")
+        return
 
     worker = _get_worker()
     print(f"[INFO] Starting ingestion for {zip_path.name}...")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Measure the figures behind the process-pool thresholds in the parsers.
+
+Prints how long a worker pool takes to start and return its first result,
+and the serial cost of one wiki page, one quiz (with its questions) and one
+PPTX deck from the given export. Dividing the first by each of the others
+gives the batch size at which a pool starts to pay off (the min_items each
+parser passes to utils.parallel.process_map). Converting decks writes their
+cover_<stem>.png thumbnails next to them, as a migration would.
+
+Usage:
+  python scripts/benchmark_parallel.py <extracted-export-dir>
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.parallel import _MP_CONTEXT
+from parsers.page_parser import _parse_page_file
+from parsers.quiz_parser import _parse_quiz_file
+from parsers.pptx_parser import _parse_pptx_file
+
+ROUNDS = 5
+
+
+def _per_item(func, course_dir: Path, items: list) -> float:
+    """Median serial seconds per item over ROUNDS passes (after one warm-up)."""
+    func(course_dir, items[0])
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for item in items:
+            func(course_dir, item)
+        times.append((time.perf_counter() - start) / len(items))
+    return median(times)
+
+
+def _pool_start(course_dir: Path, page_file: Path) -> float:
+    """Median seconds to start a pool, parse one page in it and shut it down."""
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        with ProcessPoolExecutor(mp_context=_MP_CONTEXT) as executor:
+            executor.submit(_parse_page_file, course_dir, page_file).result()
+        times.append(time.perf_counter() - start)
+    return median(times)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure process-pool start-up against per-item parse cost")
+    ap.add_argument("course_dir", type=Path, help="Extracted Canvas export")
+    course_dir = ap.parse_args().course_dir.resolve()
+
+    wiki_dir = course_dir / "wiki_content"
+    pages = sorted(p for p in wiki_dir.glob("*") if p.suffix in (".xml", ".html")) if wiki_dir.is_dir() else []
+    quizzes = sorted(course_dir.glob("*/assessment_meta.xml")) + sorted(course_dir.glob("non_cc_assessments/*/assessment_meta.xml"))
+    decks = [(deck, None) for deck in sorted(course_dir.rglob("*.pptx"))]
+
+    if not pages:
+        sys.exit("Need at least one wiki_content page to time the pool start-up")
+
+    pool_start = _pool_start(course_dir, pages[0])
+    print(f"pool start + first result: {pool_start * 1e3:8.1f} ms")
+
+    for label, func, items in (
+        ("page", _parse_page_file, pages),
+        ("quiz", _parse_quiz_file, quizzes),
+        ("pptx deck", _parse_pptx_file, decks),
+    ):
+        if not items:
+            print(f"{label:>9}: none in export")
+            continue
+        cost = _per_item(func, course_dir, items)
+        print(f"{label:>9}: {cost * 1e3:8.3f} ms each, pool pays off from ~{pool_start / cost:.0f} items")
+
+
+if __name__ == "__main__":
+    main()
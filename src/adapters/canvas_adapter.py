@@ -22,6 +22,21 @@ from observability.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Canvas API item types -> internal content_type (unknown types become pages)
+_CONTENT_TYPE_MAP = {
+    "Page": "page",
+    "Assignment": "assignment",
+    "Quiz": "quiz",
+    "DiscussionTopic": "discussion",
+    "SubHeader": "subheader",
+    "ExternalUrl": "url",
+    "File": "file"
+}
+
+# Canvas question_type values -> QuestionType, built once instead of
+# constructing the enum (and raising on unknown values) per question
+_QUESTION_TYPES = {question_type.value: question_type for question_type in QuestionType}
+
 class CanvasAdapter:
     """
     Adapter for interacting with the Canvas LMS API.
@@ -247,25 +262,13 @@ class CanvasAdapter:
 
     def _map_content_type(self, c_type: str) -> str:
         """Map Canvas item types to internal content_type."""
-        mapping = {
-            "Page": "page",
-            "Assignment": "assignment",
-            "Quiz": "quiz",
-            "DiscussionTopic": "discussion",
-            "SubHeader": "subheader",
-            "ExternalUrl": "url",
-            "File": "file"
-        }
-        return mapping.get(c_type, "page")
+        return _CONTENT_TYPE_MAP.get(c_type, "page")
 
     def _map_question_type(self, c_type: Optional[str]) -> QuestionType:
         """Map Canvas question_type string to Enum."""
         if not c_type:
              return QuestionType.MULTIPLE_CHOICE
-        try:
-            return QuestionType(c_type)
-        except ValueError:
-            return QuestionType.MULTIPLE_CHOICE
+        return _QUESTION_TYPES.get(c_type, QuestionType.MULTIPLE_CHOICE)
 
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """Safely parse Canvas ISO dates."""
@@ -105,11 +105,15 @@ REQUIRED_IMSCC_FILES = [
     'imsmanifest.xml',
 ]
 
+# Directories never scanned for course files (pipeline output, VCS metadata);
+# shared by the Validator inventory and the orphaned-content walk
+INVENTORY_EXCLUDE_DIRS = frozenset({"tutor_lms_output", ".git"})
+
 # System XML files (not content)
-SYSTEM_XML_FILES = {
+SYSTEM_XML_FILES = frozenset({
     'imsmanifest.xml',
     'course_settings.xml',
     'module_meta.xml',
     'assignment_settings.xml',
     'syllabus.html',
-}
+})
@@ -77,7 +77,13 @@ class MigrationPipeline:
             
             # Stage 2: Parsing
             self._notify("parsing", 30, "Parsing course content...")
-            parser = Parser(self.course_directory)
+            # Hand over the manifest tree and file inventory the validator built
+            parser = Parser(
+                self.course_directory,
+                manifest_root=validator.manifest_root,
+                inventory=frozenset(validation_report.inventory.all_files),
+                orphaned_files=validation_report.inventory.orphaned_files
+            )
             canvas_course, parse_report = parser.parse()
             self.report.parse_report = parse_report
             
@@ -130,7 +136,8 @@ class MigrationPipeline:
             # Track job in DB
             db_writer.track_job(self.task_id, "N/A", "completed", course_id=course_id)
             
-            self.report.migrated_content_counts = lms_course.get_content_counts()
+            # Counted while transforming; no second walk over the built course
+            self.report.migrated_content_counts = transformation_report.get_content_counts()
             logger.info("Pipeline completed successfully")
 
         except Exception as e:
@@ -24,6 +24,9 @@ from observability.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Attributes _process_html may rewrite; content without any of them is skipped
+_ASSET_ATTR_RE = re.compile(r'\b(?:src|href)\s*=', re.IGNORECASE)
+
 
 class AssetUploader:
     """
@@ -174,6 +177,10 @@ class AssetUploader:
         if not html_content or not isinstance(html_content, str):
             return html_content
 
+        # Placeholder and plain-text content has no asset URLs: skip the parse
+        if not _ASSET_ATTR_RE.search(html_content):
+            return html_content
+
         soup = BeautifulSoup(html_content, 'html.parser')
         modified = False
 
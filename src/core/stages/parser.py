@@ -4,11 +4,14 @@ Stage 2: Semantic Parsing
 Orchestrates all parsers to build complete Canvas course model.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, FrozenSet, List, Tuple
 from datetime import datetime
 
-from models.canvas_models import CanvasCourse
+from lxml import etree
+
+from models.canvas_models import CanvasCourse, CanvasPage, CanvasResource
 from models.migration_report import ParseReport, MigrationError
 from parsers.manifest_parser import ManifestParser
 from parsers.page_parser import PageParser
@@ -19,9 +22,23 @@ from parsers.weblink_parser import WebLinkParser
 from parsers.orphaned_content_handler import OrphanedContentHandler
 from parsers.pptx_parser import PptxParser
 from observability.logger import get_logger
+from utils.parallel import WorkerPool
 
 logger = get_logger(__name__)
 
+# Independent content parsers run concurrently (pages, assignments, quizzes)
+STAGE_WORKERS = 3
+
+
+def _select_pptx_resources(resources: Dict[str, CanvasResource]) -> List[Tuple[str, CanvasResource]]:
+    """Return the (identifier, resource) pairs for PPTX webcontent resources."""
+    return [
+        (res_id, resource) for res_id, resource in resources.items()
+        if resource.type and resource.href
+        and 'webcontent' in resource.type.lower()
+        and resource.href.lower().endswith('.pptx')
+    ]
+
 
 class Parser:
     """
@@ -30,7 +47,13 @@ class Parser:
     Orchestrates all parsers to build complete CanvasCourse model.
     """
     
-    def __init__(self, course_directory: Path):
+    def __init__(
+        self,
+        course_directory: Path,
+        manifest_root: Optional[etree._Element] = None,
+        inventory: Optional[FrozenSet[str]] = None,
+        orphaned_files: Optional[List[str]] = None
+    ):
         """
         Initialize the master Parser.
         
@@ -39,21 +62,34 @@ class Parser:
         
         Args:
             course_directory: The root folder containing the unzipped Canvas export.
+            manifest_root: The manifest tree already parsed by the Validator, if any,
+                so it isn't parsed a second time.
+            inventory: Relative paths ('/'-separated) of every file found by the
+                Validator; existence checks become set lookups instead of stats.
+            orphaned_files: Unreferenced files found by the Validator (relative
+                paths). The orphaned-content pass works from this list instead of
+                walking the directory again and comparing against the manifest.
         """
         self.course_directory = course_directory
+        self.inventory = inventory
+        self.orphaned_files = orphaned_files
+        
+        # One process pool for the whole stage, started only if some batch is
+        # large enough to need it and stopped when parse() returns.
+        self.worker_pool = WorkerPool()
         
         # Initialize specialized parsers for each content type.
         # manifest_parser: Reads the main course structure (the map).
-        self.manifest_parser = ManifestParser(course_directory)
+        self.manifest_parser = ManifestParser(course_directory, manifest_root=manifest_root)
         
         # page_parser: Handles wiki pages and general text content.
-        self.page_parser = PageParser(course_directory)
+        self.page_parser = PageParser(course_directory, worker_pool=self.worker_pool)
         
         # assignment_parser: Parses assignment settings and descriptions.
         self.assignment_parser = AssignmentParser(course_directory)
         
         # quiz_parser: Handles complex quiz structures and questions.
-        self.quiz_parser = QuizParser(course_directory)
+        self.quiz_parser = QuizParser(course_directory, worker_pool=self.worker_pool)
         
         # discussion_parser: Handles course discussions.
         self.discussion_parser = DiscussionParser(course_directory)
@@ -61,11 +97,12 @@ class Parser:
         # weblink_parser: Handles external web links.
         self.weblink_parser = WebLinkParser(course_directory)
         
-        # orphaned_handler: Finds files that exist but aren't listed in the manifest.
-        self.orphaned_handler = OrphanedContentHandler(course_directory)
-        
         # pptx_parser: A specialized tool for converting PowerPoint XML to HTML pages.
-        self.pptx_parser = PptxParser(course_directory)
+        self.pptx_parser = PptxParser(course_directory, worker_pool=self.worker_pool)
+        
+        # orphaned_handler: Finds files that exist but aren't listed in the manifest.
+        # Shares the PPTX parser so every deck goes through a single instance.
+        self.orphaned_handler = OrphanedContentHandler(course_directory, pptx_parser=self.pptx_parser)
     
     def parse(self) -> tuple[Optional[CanvasCourse], ParseReport]:
         """
@@ -78,6 +115,13 @@ class Parser:
         Returns:
             A tuple containing (The built CanvasCourse object, A detailed ParseReport).
         """
+        try:
+            return self._parse_course()
+        finally:
+            self.worker_pool.shutdown()
+    
+    def _parse_course(self) -> tuple[Optional[CanvasCourse], ParseReport]:
+        """Run the parse steps; parse() stops the shared worker pool afterwards."""
         report = ParseReport(timestamp=datetime.now())
         
         # Step 1: Parse manifest (the single source of truth for course structure).
@@ -88,13 +132,19 @@ class Parser:
             report.errors.extend(self.manifest_parser.errors)
             return None, report
         
+        # Steps 2-4 read disjoint files, so the page, assignment and quiz parsers
+        # run side by side. Threads suffice here: large batches go to the shared
+        # worker pool, which utils.parallel starts with forkserver/spawn so that
+        # submitting to it from these threads is safe.
+        with ThreadPoolExecutor(max_workers=STAGE_WORKERS) as executor:
+            pages_future = executor.submit(self.page_parser.parse_all_pages)
+            assignments_future = executor.submit(self.assignment_parser.find_all_assignments)
+            quizzes_future = executor.submit(self.quiz_parser.find_all_quizzes)
+        
         # Step 2: Parse wiki pages.
-        pages = self.page_parser.parse_all_pages()
+        pages = pages_future.result()
         
-        referenced_files = set()
         if course.resources:
-            referenced_files = set(r.href for r in course.resources.values() if r.href)
-
             # Build a map: href_stem -> resource_identifier
             # This lets us re-key pages from their filename stem to the resource ID
             # so the transformer can look them up by _content_ref (identifierref).
@@ -111,31 +161,22 @@ class Parser:
                     page.identifier = href_stem_to_res_id[stem_key]
 
             # Process PPTX webcontent resources
-            for res_id, resource in course.resources.items():
-                if resource.type and 'webcontent' in resource.type.lower():
-                    if resource.href and resource.href.lower().endswith('.pptx'):
-                        file_path = self.course_directory / resource.href
-                        if file_path.exists():
-                            logger.info("Converting PPTX resource", extra={"path": resource.href})
-                            pptx_page = self.pptx_parser.parse_pptx(file_path, identifier=res_id)
-                            if pptx_page:
-                                pages.append(pptx_page)
+            self._convert_pptx_resources(course, pages)
         
         course.pages = pages
         report.pages_parsed = len(pages)
         report.errors.extend(self.page_parser.errors)
-        report.errors.extend(self.pptx_parser.errors)
         
         # Step 3: Parse assignments.
         # Assignments are usually in their own subfolders with metadata and instructions.
-        assignments = self.assignment_parser.find_all_assignments()
+        assignments = assignments_future.result()
         course.assignments = assignments
         report.assignments_parsed = len(assignments)
         report.errors.extend(self.assignment_parser.errors)
         
         # Step 4: Parse quizzes.
         # Quizzes involve complex QTI-compliant question parsing.
-        quizzes = self.quiz_parser.find_all_quizzes()
+        quizzes = quizzes_future.result()
         course.quizzes = quizzes
         report.quizzes_parsed = len(quizzes)
         
@@ -152,9 +193,9 @@ class Parser:
         for res_id, resource in course.resources.items():
             if not resource.href:
                 continue
-            file_path = self.course_directory / resource.href
-            if not file_path.exists():
+            if not self._resource_exists(resource.href):
                 continue
+            file_path = self.course_directory / resource.href
                 
             if resource.type and 'discussion' in resource.type.lower():
                 discussion = self.discussion_parser.parse_discussion(file_path)
@@ -176,12 +217,45 @@ class Parser:
         # Sometimes there are files in the package that aren't mentioned in the manifest.
         # We find these (like loose slides or PDFs) and put them in a 'Recovered Content' module.
         logger.info("Processing orphaned XML/HTML files")
-        referenced_files = set(course.resources.keys())
-        orphaned_pages = self.orphaned_handler.process_all_orphaned_content(referenced_files)
+        # Without the Validator's orphan list, the handler compares files on disk
+        # with manifest hrefs: resource hrefs plus every <file> listed under a
+        # resource (QTI bodies, attachments), the same definition the Validator uses.
+        referenced_files = self.manifest_parser.referenced_files
+        orphaned_pages = self.orphaned_handler.process_all_orphaned_content(
+            referenced_files,
+            orphaned_files=self.orphaned_files
+        )
         
         # Merge discovered orphans into the main course pages collection.
         course.pages.extend(orphaned_pages)
         report.pages_parsed += len(orphaned_pages)
         report.errors.extend(self.orphaned_handler.errors)
+        # PPTX errors cover both manifest and orphaned decks (shared parser).
+        report.errors.extend(self.pptx_parser.errors)
         
         return course, report
+    
+    def _resource_exists(self, href: str) -> bool:
+        """Check a manifest href against the Validator inventory, or the disk without one."""
+        if self.inventory is not None:
+            return href.replace('\\', '/') in self.inventory
+        return (self.course_directory / href).exists()
+    
+    def _convert_pptx_resources(self, course: CanvasCourse, pages: List[CanvasPage]) -> None:
+        """
+        Convert the manifest's PPTX webcontent resources into pages.
+        
+        Args:
+            course: Course whose resources are scanned
+            pages: Page list the converted decks are appended to
+        """
+        pptx_tasks = []
+        for res_id, resource in _select_pptx_resources(course.resources):
+            if self._resource_exists(resource.href):
+                logger.debug("Converting PPTX resource", extra={"path": resource.href})
+                pptx_tasks.append((self.course_directory / resource.href, res_id))
+        
+        if pptx_tasks:
+            logger.info("Converting PPTX resources", extra={"count": len(pptx_tasks)})
+        # Decks convert in worker processes (see PptxParser.parse_pptx_files)
+        pages.extend(self.pptx_parser.parse_pptx_files(pptx_tasks))
@@ -4,10 +4,14 @@ Stage 1: Validation & Inventory
 This module validates the IMS-CC structure and builds a content inventory.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import Iterator, List, Dict, Optional, Set
 from datetime import datetime
 
+from lxml import etree
+
 from models.migration_report import (
     ValidationReport,
     ContentInventory,
@@ -16,20 +20,44 @@ from models.migration_report import (
 )
 from config.canvas_schemas import (
     REQUIRED_IMSCC_FILES,
-    SYSTEM_XML_FILES,
+    INVENTORY_EXCLUDE_DIRS,
     CANVAS_PATHS
 )
-from utils.xml_utils import parse_xml_file, find_elements, get_element_attribute
-from utils.file_utils import (
-    validate_file_exists,
-    validate_directory_exists,
-    find_files_recursive,
-    is_xml_file,
-    is_html_file,
-    is_image_file,
-    is_video_file,
-    get_file_extension
-)
+from utils.xml_utils import parse_xml_file
+from parsers.manifest_parser import collect_referenced_hrefs, is_orphaned_file
+from utils.file_utils import validate_file_exists, validate_directory_exists, classify_extension
+
+# classify_extension() kind -> ContentInventory counter
+_INVENTORY_COUNTERS = {
+    'xml': 'modules',  # Rough estimate
+    'html': 'pages',  # Rough estimate
+    'image': 'images',
+    'video': 'videos',
+    'document': 'documents',
+    'other': 'other_files',
+}
+
+
+def _walk_files(directory: str) -> Iterator[os.DirEntry]:
+    """
+    Yield every file below directory, skipping INVENTORY_EXCLUDE_DIRS.
+    
+    Uses os.scandir so file/dir checks reuse the type information returned
+    with the directory listing instead of a stat per path. Unreadable
+    directories are skipped, as the rglob walk it replaces did.
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name in INVENTORY_EXCLUDE_DIRS:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file():
+                yield entry
 
 
 class Validator:
@@ -54,6 +82,9 @@ class Validator:
         self.errors: List[MigrationError] = []
         self.referenced_files: Set[str] = set()
         self.all_files: Set[str] = set()
+        
+        # Parsed manifest root, kept for later checks and for the Parser stage.
+        self.manifest_root: Optional[etree._Element] = None
     
     def validate(self) -> ValidationReport:
         """
@@ -72,22 +103,28 @@ class Validator:
         if not self._validate_directory_structure(report):
             return report
         
-        # Step 2: Validate manifest file.
-        # Ensure 'imsmanifest.xml' is present and is valid XML.
-        if not self._validate_manifest(report):
+        # Steps 2 and 3 are independent, so they overlap: the file walk (I/O)
+        # runs on a worker thread while the manifest is parsed here.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Step 3: Build file inventory.
+            # Scan the entire folder to see what files are actually present on disk.
+            inventory_future = executor.submit(self._build_file_inventory, report)
+            
+            # Step 2: Validate manifest file.
+            # Ensure 'imsmanifest.xml' is present and is valid XML.
+            manifest_valid = self._validate_manifest(report)
+        file_kinds = inventory_future.result()
+        if not manifest_valid:
             return report
         
-        # Step 3: Build file inventory.
-        # Scan the entire folder to see what files are actually present on disk.
-        self._build_file_inventory(report)
-        
         # Step 4: Validate file references.
         # Cross-reference the manifest against the disk to find 'broken' links.
-        self._validate_file_references(report)
+        hrefs = self._collect_file_references(report)
+        self._validate_file_references(report, hrefs)
         
         # Step 5: Detect orphaned content.
         # Find files that exist on disk but aren't mentioned in the manifest.
-        self._detect_orphaned_content(report)
+        self._detect_orphaned_content(report, file_kinds)
         
         # Determine if validation passed.
         # Only 'CRITICAL' errors (like missing manifest) actually fail the validation.
@@ -162,6 +199,7 @@ class Validator:
                 raise Exception("Failed to parse manifest")
             
             report.manifest_valid_xml = True
+            self.manifest_root = root
             
             # Basic schema validation (check for required elements)
             if root.tag.endswith('manifest'):
@@ -188,140 +226,126 @@ class Validator:
         
         return True
     
-    def _build_file_inventory(self, report: ValidationReport) -> None:
+    def _collect_file_references(self, report: ValidationReport) -> List[str]:
+        """
+        Collect the hrefs of all files referenced in the manifest.
+        
+        Args:
+            report: ValidationReport to update
+            
+        Returns:
+            Referenced hrefs in document order (duplicates kept)
+        """
+        # Reuse the tree parsed by _validate_manifest
+        root = self.manifest_root
+        if root is None:
+            return []
+        
+        hrefs: List[str] = []
+        try:
+            # Same definition the Parser's orphaned-content pass uses
+            hrefs = collect_referenced_hrefs(root)
+        
+        except Exception as e:
+            self.errors.append(MigrationError(
+                severity=ErrorSeverity.ERROR,
+                error_type="REFERENCE_VALIDATION_ERROR",
+                message=f"Error validating file references: {str(e)}",
+                suggested_action="Check manifest structure"
+            ))
+        
+        self.referenced_files.update(hrefs)
+        report.total_referenced_files += len(hrefs)
+        return hrefs
+    
+    def _build_file_inventory(self, report: ValidationReport) -> List[str]:
         """
         Build inventory of all files in the course directory.
         
         Args:
             report: ValidationReport to update
+            
+        Returns:
+            classify_extension() kind of each file, aligned with inventory.all_files
         """
         inventory = ContentInventory()
+        counts = dict.fromkeys(_INVENTORY_COUNTERS.values(), 0)
+        file_kinds: List[str] = []
         
-        # Find all files recursively
-        all_files = find_files_recursive(
-            self.course_directory,
-            pattern="*",
-            exclude_dirs=["tutor_lms_output", ".git"]
-        )
+        # Relative paths are sliced off the walked path (no Path objects per file)
+        prefix_len = len(os.path.join(str(self.course_directory), ''))
         
-        for file_path in all_files:
-            relative_path = str(file_path.relative_to(self.course_directory))
+        for entry in _walk_files(str(self.course_directory)):
+            relative_path = entry.path[prefix_len:]
+            if os.sep != '/':
+                # Match manifest hrefs, which always use forward slashes
+                relative_path = relative_path.replace(os.sep, '/')
             self.all_files.add(relative_path)
             inventory.all_files.append(relative_path)
             
-            # Categorize by type
-            if is_xml_file(file_path):
-                inventory.modules += 1  # Rough estimate
-            elif is_html_file(file_path):
-                inventory.pages += 1  # Rough estimate
-            elif is_image_file(file_path):
-                inventory.images += 1
-            elif is_video_file(file_path):
-                inventory.videos += 1
-            elif get_file_extension(file_path) in ('pdf', 'doc', 'docx', 'ppt', 'pptx'):
-                inventory.documents += 1
-            else:
-                inventory.other_files += 1
+            # Categorize by type (cached classification of the extension)
+            stem, _, extension = entry.name.rpartition('.')
+            kind = classify_extension(extension) if stem else 'other'
+            counts[_INVENTORY_COUNTERS[kind]] += 1
+            file_kinds.append(kind)
+        
+        for category, count in counts.items():
+            setattr(inventory, category, count)
         
         report.inventory = inventory
+        return file_kinds
     
-    def _validate_file_references(self, report: ValidationReport) -> None:
+    def _validate_file_references(self, report: ValidationReport, hrefs: List[str]) -> None:
         """
         Validate that all files referenced in manifest exist.
         
         Args:
             report: ValidationReport to update
+            hrefs: Referenced hrefs from _collect_file_references
         """
-        try:
-            root = parse_xml_file(self.manifest_path)
-            if root is None:
-                return
-            
-            # Find all resource elements
-            # Try with namespace first
-            resources = find_elements(root, './/resource', {})
-            
-            # If not found, try without namespace
-            if not resources:
-                resources = root.findall('.//resource')
-            
-            for resource in resources:
-                href = get_element_attribute(resource, 'href')
-                if href:
-                    self.referenced_files.add(href)
-                    report.total_referenced_files += 1
-                    
-                    # Check if file exists
-                    file_path = self.course_directory / href
-                    if not validate_file_exists(file_path):
-                        report.missing_files += 1
-                        report.missing_file_list.append(href)
-                        
-                        self.errors.append(MigrationError(
-                            severity=ErrorSeverity.WARNING,
-                            error_type="MISSING_REFERENCED_FILE",
-                            message=f"File referenced in manifest not found: {href}",
-                            file_path=str(file_path),
-                            suggested_action="File may have been deleted or path is incorrect"
-                        ))
+        for href in hrefs:
+            # Check if file exists: the inventory already lists every file,
+            # so this is a set lookup rather than a stat per reference
+            if href.replace('\\', '/') not in self.all_files:
+                report.missing_files += 1
+                report.missing_file_list.append(href)
                 
-                # Check file elements within resource
-                files = resource.findall('.//file')
-                for file_elem in files:
-                    href = get_element_attribute(file_elem, 'href')
-                    if href:
-                        self.referenced_files.add(href)
-                        report.total_referenced_files += 1
-                        
-                        file_path = self.course_directory / href
-                        if not validate_file_exists(file_path):
-                            report.missing_files += 1
-                            report.missing_file_list.append(href)
-                            
-                            self.errors.append(MigrationError(
-                                severity=ErrorSeverity.WARNING,
-                                error_type="MISSING_REFERENCED_FILE",
-                                message=f"File referenced in manifest not found: {href}",
-                                file_path=str(file_path),
-                                suggested_action="File may have been deleted or path is incorrect"
-                            ))
-        
-        except Exception as e:
-            self.errors.append(MigrationError(
-                severity=ErrorSeverity.ERROR,
-                error_type="REFERENCE_VALIDATION_ERROR",
-                message=f"Error validating file references: {str(e)}",
-                suggested_action="Check manifest structure"
-            ))
+                self.errors.append(MigrationError(
+                    severity=ErrorSeverity.WARNING,
+                    error_type="MISSING_REFERENCED_FILE",
+                    message=f"File referenced in manifest not found: {href}",
+                    file_path=str(self.course_directory / href),
+                    suggested_action="File may have been deleted or path is incorrect"
+                ))
     
-    def _detect_orphaned_content(self, report: ValidationReport) -> None:
+    def _detect_orphaned_content(self, report: ValidationReport, file_kinds: List[str]) -> None:
         """
         Detect files that exist but are not referenced in manifest.
         
+        Works from the in-memory inventory: no filesystem access, and each
+        file's kind is reused from the inventory walk.
+        
         Args:
             report: ValidationReport to update
+            file_kinds: Kinds returned by _build_file_inventory
         """
-        # Find orphaned files
-        orphaned = self.all_files - self.referenced_files
-        
-        # Filter out system files
-        for file_path in orphaned:
-            # Skip system files
-            file_name = Path(file_path).name
-            if file_name in SYSTEM_XML_FILES:
-                continue
-            
-            # Skip output directory
-            if 'tutor_lms_output' in file_path:
+        inventory = report.inventory
+        # Manifest hrefs may use either separator
+        referenced_files = {href.replace('\\', '/') for href in self.referenced_files}
+        
+        for file_path, kind in zip(inventory.all_files, file_kinds):
+            # Skip referenced and system files (the pipeline output directory
+            # is already pruned from the walk)
+            if not is_orphaned_file(file_path, referenced_files):
                 continue
             
-            report.inventory.orphaned_files.append(file_path)
+            inventory.orphaned_files.append(file_path)
             
             # Categorize orphaned content
-            if is_xml_file(Path(file_path)):
-                report.inventory.orphaned_xml_files += 1
-            elif is_html_file(Path(file_path)):
-                report.inventory.orphaned_html_files += 1
+            if kind == 'xml':
+                inventory.orphaned_xml_files += 1
+            elif kind == 'html':
+                inventory.orphaned_html_files += 1
             
             # Log as info (not an error, but worth noting)
             self.errors.append(MigrationError(
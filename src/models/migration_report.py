@@ -4,6 +4,7 @@ Migration report data models.
 These models represent the output reports from the migration pipeline.
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from datetime import datetime
@@ -173,8 +174,8 @@ class TransformationReport:
     assignments_created: int = 0
     questions_created: int = 0
     
-    # Question type mappings
-    question_type_mappings: Dict[str, int] = field(default_factory=dict)
+    # Question type mappings (Canvas question type -> count)
+    question_type_mappings: Dict[str, int] = field(default_factory=Counter)
     
     # Asset info
     assets_identified: int = 0
@@ -183,6 +184,16 @@ class TransformationReport:
     # Errors
     errors: List[MigrationError] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    
+    def get_content_counts(self) -> Dict[str, int]:
+        """Counts of migrated content, keyed like the report's migrated_content_counts."""
+        return {
+            "topics": self.modules_created,
+            "lessons": self.lessons_created,
+            "quizzes": self.quizzes_created,
+            "assignments": self.assignments_created,
+            "questions": self.questions_created,
+        }
 
 
 @dataclass
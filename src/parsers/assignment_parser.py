@@ -4,6 +4,8 @@ Assignment Parser - Parses Canvas assignments.
 Extracts assignment data from assignment_settings.xml files.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
@@ -11,8 +13,49 @@ from datetime import datetime
 from models.canvas_models import CanvasAssignment, SubmissionType, WorkflowState
 from models.migration_report import MigrationError, ErrorSeverity
 from utils.xml_utils import parse_xml_file, find_element, find_elements, get_element_text
-from utils.html_utils import clean_html
+from utils.html_utils import clean_html, get_body_content
 from config.canvas_schemas import CANVAS_NAMESPACES
+from observability.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lookup tables for enum values read from assignment XML (unknown values are skipped)
+_SUBMISSION_MAP = {m.value: m for m in SubmissionType}
+_WORKFLOW_MAP = {
+    'unpublished': WorkflowState.UNPUBLISHED,
+    'deleted': WorkflowState.DELETED,
+}
+
+# Threads used to read HTML description fallbacks (I/O bound)
+HTML_FALLBACK_WORKERS = 8
+
+
+def _read_html_description(assignment_dir: Path) -> str:
+    """
+    Read an assignment description from an HTML file in its directory.
+    
+    Used when assignment_settings.xml has no description.
+    
+    Args:
+        assignment_dir: Path to assignment directory
+        
+    Returns:
+        Body content of the HTML file, or empty string if none is readable
+    """
+    html_files = list(assignment_dir.glob("*.html"))
+    if not html_files:
+        return ""
+    
+    # Simple strategy: take the first one that isn't some system file
+    target_html = html_files[0]
+    try:
+        with open(target_html, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        # Extract body content if it's a full HTML doc
+        return get_body_content(html_content) or html_content
+    except Exception as e:
+        logger.warning("Failed to read HTML description", extra={"path": str(target_html), "error": str(e)})
+        return ""
 
 
 class AssignmentParser:
@@ -30,23 +73,30 @@ class AssignmentParser:
         self.course_directory = course_directory
         self.errors: List[MigrationError] = []
     
-    def parse_assignment(self, assignment_dir: Path) -> Optional[CanvasAssignment]:
+    def parse_assignment(
+        self,
+        assignment_dir: Path,
+        read_html_fallback: bool = True
+    ) -> Optional[CanvasAssignment]:
         """
         Parse an assignment from its directory.
         
         Args:
             assignment_dir: Path to assignment directory
+            read_html_fallback: Read the description from an HTML file when the
+                settings have none (callers batching this themselves pass False)
             
         Returns:
             CanvasAssignment object or None if parsing fails
         """
         settings_file = assignment_dir / "assignment_settings.xml"
         
-        if not settings_file.exists():
-            return None
-        
         try:
-            root = parse_xml_file(settings_file)
+            try:
+                root = parse_xml_file(settings_file)
+            except FileNotFoundError:
+                # Not an assignment directory
+                return None
             if root is None:
                 self.errors.append(MigrationError(
                     severity=ErrorSeverity.ERROR,
@@ -61,20 +111,8 @@ class AssignmentParser:
             description = self._extract_description(root)
             
             # Fallback: Check for HTML file if description is empty
-            if not description:
-                html_files = list(assignment_dir.glob("*.html"))
-                if html_files:
-                    try:
-                        from utils.html_utils import get_body_content
-                        # Prefer file with same name as directory or assignment if possible, otherwise first html
-                        # Simple strategy: take the first one that isn't some system file
-                        target_html = html_files[0]
-                        with open(target_html, 'r', encoding='utf-8') as f:
-                            html_content = f.read()
-                            # Extract body content if it's a full HTML doc
-                            description = get_body_content(html_content) or html_content
-                    except Exception as e:
-                        print(f"Warning: Failed to read HTML description from {html_files[0]}: {e}")
+            if not description and read_html_fallback:
+                description = _read_html_description(assignment_dir)
             
             points_possible = float(get_element_text(find_element(root, './/canvas:points_possible', CANVAS_NAMESPACES), "0"))
             grading_type = get_element_text(find_element(root, './/canvas:grading_type', CANVAS_NAMESPACES), "points")
@@ -118,11 +156,9 @@ class AssignmentParser:
         if types_elem is not None:
             types_text = get_element_text(types_elem, "")
             for type_str in types_text.split(','):
-                type_str = type_str.strip()
-                try:
-                    submission_types.append(SubmissionType(type_str))
-                except ValueError:
-                    pass  # Skip unknown types
+                st = _SUBMISSION_MAP.get(type_str.strip())
+                if st is not None:
+                    submission_types.append(st)
         
         return submission_types
     
@@ -131,10 +167,7 @@ class AssignmentParser:
         state_elem = find_element(root, './/canvas:workflow_state', CANVAS_NAMESPACES)
         if state_elem is not None:
             state_text = get_element_text(state_elem, "active").lower()
-            if state_text == "unpublished":
-                return WorkflowState.UNPUBLISHED
-            elif state_text == "deleted":
-                return WorkflowState.DELETED
+            return _WORKFLOW_MAP.get(state_text, WorkflowState.ACTIVE)
         return WorkflowState.ACTIVE
     
     def find_all_assignments(self) -> List[CanvasAssignment]:
@@ -146,13 +179,28 @@ class AssignmentParser:
         """
         assignments = []
         
-        # Find all directories with assignment_settings.xml
-        for item in self.course_directory.iterdir():
-            if item.is_dir():
-                settings_file = item / "assignment_settings.xml"
-                if settings_file.exists():
-                    assignment = self.parse_assignment(item)
-                    if assignment:
-                        assignments.append(assignment)
+        # Directories whose settings have no description (HTML fallback pending)
+        pending: List[tuple[CanvasAssignment, Path]] = []
+        
+        # Find all directories with assignment_settings.xml.
+        # scandir reuses the readdir type info, and parse_assignment skips
+        # directories without a settings file, so no extra stat per entry.
+        with os.scandir(self.course_directory) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                assignment_dir = Path(entry.path)
+                assignment = self.parse_assignment(assignment_dir, read_html_fallback=False)
+                if assignment:
+                    assignments.append(assignment)
+                    if not assignment.description:
+                        pending.append((assignment, assignment_dir))
+        
+        # Read HTML fallbacks concurrently; file reads release the GIL
+        if pending:
+            with ThreadPoolExecutor(max_workers=HTML_FALLBACK_WORKERS) as executor:
+                bodies = executor.map(_read_html_description, [d for _, d in pending])
+                for (assignment, _), body in zip(pending, bodies):
+                    assignment.description = body
         
         return assignments
@@ -4,6 +4,12 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import lxml.etree as ET
 
+try:
+    # orjson parses large course_export.json files several times faster
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 class CanvasExportParser:
     """
     Parses Canvas native export packages (containing course_export.json).
@@ -23,8 +29,8 @@ class CanvasExportParser:
 
         try:
             # 1. Parse main export JSON
-            with open(self.export_json_path, 'r', encoding='utf-8') as f:
-                export_data = json.load(f)
+            with open(self.export_json_path, 'rb') as f:
+                export_data = _json_loads(f.read())
 
             title = export_data.get('course', {}).get('title', 'Untitled Course')
             description = export_data.get('course', {}).get('public_description', '')
@@ -4,10 +4,17 @@ Manifest Parser - Single source of truth for course structure.
 Parses imsmanifest.xml to extract course structure, modules, and resource references.
 """
 
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AbstractSet, Any, Dict, List, Optional, Set
 from datetime import datetime
 
+from lxml import etree
+
 from models.canvas_models import (
     CanvasCourse,
     CanvasModule,
@@ -16,7 +23,7 @@ from models.canvas_models import (
     WorkflowState
 )
 from models.migration_report import MigrationError, ErrorSeverity
-from config.canvas_schemas import IMS_CC_NAMESPACES, CANVAS_PATHS
+from config.canvas_schemas import IMS_CC_NAMESPACES, CANVAS_PATHS, SYSTEM_XML_FILES
 from utils.xml_utils import (
     parse_xml_file,
     find_element,
@@ -28,22 +35,152 @@ from observability.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Module item content types shared by every parsed CanvasModuleItem
+CONTENT_TYPE_QUIZ = 'quiz'
+CONTENT_TYPE_ASSIGNMENT = 'assignment'
+CONTENT_TYPE_PAGE = 'page'
+CONTENT_TYPE_DISCUSSION = 'discussion'
+CONTENT_TYPE_WEBLINK = 'weblink'
+
+# Resource type keyword -> content type, checked in order (first match wins).
+# AssociatedContent wraps assignments: its href points to the assignment
+# subfolder XML, so it is treated as an assignment.
+_TYPE_KEYWORDS = (
+    ('assessment', CONTENT_TYPE_QUIZ),
+    ('assignment', CONTENT_TYPE_ASSIGNMENT),
+    ('webcontent', CONTENT_TYPE_PAGE),
+    ('discussion', CONTENT_TYPE_DISCUSSION),
+    ('weblink', CONTENT_TYPE_WEBLINK),
+    ('imswl', CONTENT_TYPE_WEBLINK),
+    ('associatedcontent', CONTENT_TYPE_ASSIGNMENT),
+)
+
+# Manifest <resource> elements and the <file> elements inside them, matched
+# by local name so namespaced (IMS CC) and plain manifests both work
+_XP_REFERENCES = etree.XPath(
+    '//*[local-name()="resource"]'
+    ' | //*[local-name()="resource"]//*[local-name()="file"]'
+)
+
+# Parsed-manifest cache: set MANIFEST_CACHE_DIR to reuse the CanvasCourse
+# skeleton across runs while imsmanifest.xml is unchanged (disabled if unset).
+# Stored as plain JSON, so a tampered cache can't execute code; bump the
+# version whenever the cached fields change.
+MANIFEST_CACHE_ENV = 'MANIFEST_CACHE_DIR'
+CACHE_FORMAT_VERSION = 3
+
+
+def collect_referenced_hrefs(root: etree._Element) -> List[str]:
+    """
+    Collect the hrefs of every manifest resource and of the <file> elements
+    inside them. This is the single definition of a "referenced" file, shared
+    by the Validator and the orphaned-content pass.
+    
+    Args:
+        root: Manifest root element
+        
+    Returns:
+        Referenced hrefs in document order (duplicates kept)
+    """
+    # One compiled query returns resources and the file elements inside
+    # them in document order (a resource precedes its files)
+    return [href for elem in _XP_REFERENCES(root) if (href := elem.get('href'))]
+
+
+def is_orphaned_file(rel_path: str, referenced_hrefs: AbstractSet[str]) -> bool:
+    """
+    Decide whether a course file is orphaned content: not referenced by the
+    manifest and not a Canvas system file. Shared by the Validator and the
+    orphaned-content pass so both flag the same files.
+    
+    Args:
+        rel_path: '/'-separated path relative to the course directory
+        referenced_hrefs: '/'-separated hrefs from collect_referenced_hrefs
+        
+    Returns:
+        True if the file is orphaned
+    """
+    return rel_path not in referenced_hrefs and rel_path.rpartition('/')[2] not in SYSTEM_XML_FILES
+
+
+def _item_to_cache(item: CanvasModuleItem) -> Dict[str, Any]:
+    """Serialize the manifest-derived fields of a module item (recursively)."""
+    return {
+        'title': item.title,
+        'identifier': item.identifier,
+        'content_type': item.content_type,
+        'content_file': item.content_file,
+        'content_ref': item._content_ref,
+        'position': item.position,
+        'items': [_item_to_cache(child) for child in item.items],
+    }
+
+
+def _item_from_cache(data: Dict[str, Any]) -> CanvasModuleItem:
+    """Rebuild a module item written by _item_to_cache."""
+    item = CanvasModuleItem(
+        title=data['title'],
+        identifier=data['identifier'],
+        content_type=data['content_type'],
+        content_file=data['content_file'],
+        items=[_item_from_cache(child) for child in data['items']],
+        position=data['position'],
+        workflow_state=WorkflowState.ACTIVE
+    )
+    item._content_ref = data['content_ref']
+    return item
+
+
+def _course_to_cache(course: CanvasCourse) -> Dict[str, Any]:
+    """Serialize the course skeleton built by ManifestParser.parse."""
+    return {
+        'title': course.title,
+        'identifier': course.identifier,
+        'modules': [
+            {
+                'title': module.title,
+                'identifier': module.identifier,
+                'position': module.position,
+                'items': [_item_to_cache(item) for item in module.items],
+            }
+            for module in course.modules
+        ],
+        # file_exists/resolved_path are not cached: they are re-checked on load
+        'resources': [
+            {'identifier': r.identifier, 'href': r.href, 'type': r.type}
+            for r in course.resources.values()
+        ],
+    }
+
+
+def _error_to_cache(error: MigrationError) -> Dict[str, Any]:
+    """Serialize a MigrationError (its timestamp is reset on load)."""
+    data = asdict(error)
+    data['severity'] = error.severity.value
+    del data['timestamp']
+    return data
+
 
 class ManifestParser:
     """
     Parses imsmanifest.xml to build course structure.
     """
     
-    def __init__(self, course_directory: Path):
+    def __init__(self, course_directory: Path, manifest_root: Optional[etree._Element] = None):
         """
         Initialize manifest parser.
         
         Args:
             course_directory: Path to Canvas course export directory
+            manifest_root: Already-parsed imsmanifest.xml root (e.g. from the
+                Validator); the file is parsed again only if omitted
         """
         self.course_directory = course_directory
         self.manifest_path = course_directory / CANVAS_PATHS['MANIFEST']
+        self.manifest_root = manifest_root
         self.errors: List[MigrationError] = []
+        # Resource and <file> hrefs of the parsed manifest (set by parse())
+        self.referenced_files: Set[str] = set()
     
     def parse(self) -> Optional[CanvasCourse]:
         """
@@ -52,8 +189,14 @@ class ManifestParser:
         Returns:
             CanvasCourse object or None if parsing fails
         """
+        cached_course = self._load_cached_course()
+        if cached_course is not None:
+            return cached_course
+        
         try:
-            root = parse_xml_file(self.manifest_path)
+            root = self.manifest_root
+            if root is None:
+                root = parse_xml_file(self.manifest_path)
             if root is None:
                 self.errors.append(MigrationError(
                     severity=ErrorSeverity.CRITICAL,
@@ -63,6 +206,8 @@ class ManifestParser:
                 ))
                 return None
             
+            self.referenced_files = set(collect_referenced_hrefs(root))
+            
             # Extract course metadata
             course_title = self._extract_course_title(root)
             course_id = get_element_attribute(root, 'identifier', 'unknown')
@@ -83,6 +228,7 @@ class ManifestParser:
                 created_at=datetime.now()
             )
             
+            self._store_cached_course(course)
             return course
             
         except Exception as e:
@@ -94,6 +240,130 @@ class ManifestParser:
             ))
             return None
     
+    def _cache_entry(self) -> Optional[tuple]:
+        """
+        Locate the cache file and key for the current manifest.
+        
+        Returns:
+            (cache file path, [mtime_ns, size] key), or None if caching is disabled
+            or the manifest can't be stat'ed
+        """
+        cache_dir = os.getenv(MANIFEST_CACHE_ENV)
+        if not cache_dir:
+            return None
+        try:
+            stat = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        name = hashlib.sha1(str(self.manifest_path.resolve()).encode('utf-8')).hexdigest()
+        return Path(cache_dir) / f"{name}.json", [stat.st_mtime_ns, stat.st_size]
+    
+    def _load_cached_course(self) -> Optional[CanvasCourse]:
+        """
+        Return the cached course skeleton if the manifest is unchanged.
+        
+        Resource file_exists/resolved_path are re-checked against the disk,
+        since course files can change without the manifest changing.
+        
+        Returns:
+            CanvasCourse from the cache, or None on a miss
+        """
+        entry = self._cache_entry()
+        if entry is None:
+            return None
+        cache_file, key = entry
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_FORMAT_VERSION or data.get('key') != key:
+                return None
+            course = self._course_from_cache(data['course'])
+            errors = [
+                MigrationError(**{**error, 'severity': ErrorSeverity(error['severity'])})
+                for error in data['errors']
+            ]
+            referenced_files = set(data['referenced_files'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug("Ignoring unreadable manifest cache", extra={"path": str(cache_file), "error": str(e)})
+            return None
+        
+        logger.debug("Using cached manifest", extra={"path": str(cache_file)})
+        self.errors.extend(errors)
+        self.referenced_files = referenced_files
+        return course
+    
+    def _course_from_cache(self, data: Dict[str, Any]) -> CanvasCourse:
+        """
+        Rebuild a course skeleton written by _course_to_cache.
+        
+        Args:
+            data: Cached course fields
+            
+        Returns:
+            CanvasCourse with resources resolved against the current disk
+        """
+        resources = {}
+        for res in data['resources']:
+            resource = CanvasResource(identifier=res['identifier'], href=res['href'], type=res['type'])
+            self._resolve_resource(resource)
+            resources[resource.identifier] = resource
+        
+        modules = [
+            CanvasModule(
+                title=module['title'],
+                identifier=module['identifier'],
+                position=module['position'],
+                items=[_item_from_cache(item) for item in module['items']],
+                workflow_state=WorkflowState.ACTIVE
+            )
+            for module in data['modules']
+        ]
+        
+        return CanvasCourse(
+            title=data['title'],
+            identifier=data['identifier'],
+            modules=modules,
+            resources=resources,
+            source_directory=str(self.course_directory),
+            created_at=datetime.now()
+        )
+    
+    def _store_cached_course(self, course: CanvasCourse) -> None:
+        """
+        Write the course skeleton to the cache (atomically; failures are ignored).
+        
+        The cache directory is created private to the current user and the
+        file is written with mkstemp's owner-only permissions.
+        
+        Args:
+            course: Freshly parsed course
+        """
+        entry = self._cache_entry()
+        if entry is None:
+            return
+        cache_file, key = entry
+        data = {
+            'version': CACHE_FORMAT_VERSION,
+            'key': key,
+            'course': _course_to_cache(course),
+            'errors': [_error_to_cache(error) for error in self.errors],
+            'referenced_files': sorted(self.referenced_files),
+        }
+        try:
+            cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.debug("Could not write manifest cache", extra={"path": str(cache_file), "error": str(e)})
+    
     def _extract_course_title(self, root) -> str:
         """
         Extract course title from manifest.
@@ -151,28 +421,33 @@ class ManifestParser:
             res_type = get_element_attribute(resource_elem, 'type')
             
             if identifier:
-                # Check if file exists
-                file_exists = False
-                resolved_path = None
-                
-                if href:
-                    file_path = self.course_directory / href
-                    file_exists = file_path.exists()
-                    if file_exists:
-                        resolved_path = str(file_path)
-                
                 resource = CanvasResource(
                     identifier=identifier,
                     href=href,
-                    type=res_type,
-                    file_exists=file_exists,
-                    resolved_path=resolved_path
+                    type=res_type
                 )
+                # Check if file exists
+                self._resolve_resource(resource)
                 
                 resource_map[identifier] = resource
         
         return resource_map
     
+    def _resolve_resource(self, resource: CanvasResource) -> None:
+        """
+        Set a resource's file_exists and resolved_path from the disk.
+        
+        Args:
+            resource: Resource to check (updated in place)
+        """
+        resource.file_exists = False
+        resource.resolved_path = None
+        if resource.href:
+            file_path = self.course_directory / resource.href
+            if file_path.exists():
+                resource.file_exists = True
+                resource.resolved_path = str(file_path)
+    
     def _parse_organization(
         self,
         root,
@@ -318,20 +593,10 @@ class ManifestParser:
             # Infer content type from resource type
             if resource.type:
                 res_type = resource.type.lower()
-                if 'assessment' in res_type:
-                    content_type = 'quiz'
-                elif 'assignment' in res_type:
-                    content_type = 'assignment'
-                elif 'webcontent' in res_type:
-                    content_type = 'page'
-                elif 'discussion' in res_type:
-                    content_type = 'discussion'
-                elif 'weblink' in res_type or 'imswl' in res_type:
-                    content_type = 'weblink'
-                elif 'associatedcontent' in res_type:
-                    # AssociatedContent wraps assignments — the href points to the
-                    # assignment subfolder XML, so treat as assignment.
-                    content_type = 'assignment'
+                for keyword, item_type in _TYPE_KEYWORDS:
+                    if keyword in res_type:
+                        content_type = item_type
+                        break
         
         # Parse nested items (sub-items)
         nested_items = []
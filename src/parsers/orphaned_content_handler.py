@@ -4,8 +4,9 @@ Orphaned Content Handler - Handles XML files not referenced in manifest.
 This includes PowerPoint XML exports, loose HTML files, and other orphaned content.
 """
 
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from lxml import etree
 
 from models.canvas_models import CanvasPage, WorkflowState
@@ -13,9 +14,16 @@ from models.migration_report import MigrationError, ErrorSeverity
 from utils.xml_utils import parse_xml_file, find_element, get_element_text, get_inner_html
 from utils.html_utils import clean_html
 from utils.file_utils import is_xml_file, is_html_file
-from config.canvas_schemas import SYSTEM_XML_FILES
+from config.canvas_schemas import INVENTORY_EXCLUDE_DIRS
+from observability.logger import get_logger
+from .manifest_parser import is_orphaned_file
 from .pptx_parser import PptxParser
 
+logger = get_logger(__name__)
+
+# Orphan file extensions we can convert, in processing order
+ORPHAN_EXTENSIONS = ('xml', 'html', 'pptx')
+
 
 class OrphanedContentHandler:
     """
@@ -28,51 +36,99 @@ class OrphanedContentHandler:
     - Other XML content files
     """
     
-    def __init__(self, course_directory: Path):
+    def __init__(self, course_directory: Path, pptx_parser: Optional[PptxParser] = None):
         """
         Initialize orphaned content handler.
         
         Args:
             course_directory: Path to Canvas course export directory
+            pptx_parser: Optional shared PptxParser (a new one is created if omitted)
         """
         self.course_directory = course_directory
-        self.pptx_parser = PptxParser(course_directory)
+        self.pptx_parser = pptx_parser or PptxParser(course_directory)
         self.errors: List[MigrationError] = []
     
-    def find_orphaned_xml_files(self, referenced_files: set) -> List[Path]:
+    def _walk_files(self) -> Iterator[Tuple[str, os.DirEntry]]:
         """
-        Find XML files not referenced in manifest.
+        Walk the course directory once with os.scandir.
+        
+        INVENTORY_EXCLUDE_DIRS (our output folder, VCS metadata) are pruned,
+        as in the Validator's inventory walk.
+        Relative paths are sliced off entry.path; no Path objects are built.
+        
+        Yields:
+            Tuples of (relative path with '/' separators, directory entry)
+        """
+        root = str(self.course_directory)
+        prefix_len = len(os.path.join(root, ''))
+        stack = [root]
+        
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in INVENTORY_EXCLUDE_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        rel_path = entry.path[prefix_len:].replace(os.sep, '/')
+                        yield rel_path, entry
+    
+    def _collect_orphaned_files(
+        self,
+        referenced_files: set,
+        orphaned_files: Optional[List[str]] = None
+    ) -> Dict[str, List[Path]]:
+        """
+        Group unreferenced files by extension.
         
         Args:
             referenced_files: Set of files referenced in manifest
+            orphaned_files: Unreferenced files already found by the Validator
+                (relative paths); when given, no directory walk is done and
+                referenced_files is not consulted
             
         Returns:
-            List of orphaned XML file paths
+            Dictionary mapping each extension in ORPHAN_EXTENSIONS to orphaned file paths
         """
-        orphaned = []
+        if orphaned_files is not None:
+            referenced = frozenset()
+            candidates = ((rel_path, rel_path.rpartition('/')[2]) for rel_path in orphaned_files)
+        else:
+            # Manifest hrefs may use either separator
+            referenced = {ref.replace('\\', '/') for ref in referenced_files if ref}
+            candidates = ((rel_path, entry.name) for rel_path, entry in self._walk_files())
         
-        # Search entire directory
-        for xml_file in self.course_directory.rglob("*.xml"):
-            # Skip system files
-            if xml_file.name in SYSTEM_XML_FILES:
-                continue
-            
-            # Skip output directory
-            if 'tutor_lms_output' in str(xml_file):
-                continue
-            
-            # Get relative path
-            try:
-                rel_path = str(xml_file.relative_to(self.course_directory))
-            except ValueError:
+        orphaned: Dict[str, List[Path]] = {ext: [] for ext in ORPHAN_EXTENSIONS}
+        
+        for rel_path, name in candidates:
+            # Case-sensitive, like the *.xml / *.html / *.pptx globs it replaces
+            ext = name.rsplit('.', 1)[-1]
+            bucket = orphaned.get(ext)
+            # Same test as the Validator's orphan detection
+            if bucket is None or not is_orphaned_file(rel_path, referenced):
                 continue
             
-            # Check if referenced
-            if rel_path not in referenced_files:
-                orphaned.append(xml_file)
+            # Only orphans become Path objects
+            bucket.append(self.course_directory / rel_path)
         
         return orphaned
     
+    def find_orphaned_xml_files(self, referenced_files: set) -> List[Path]:
+        """
+        Find XML files not referenced in manifest.
+        
+        Args:
+            referenced_files: Set of files referenced in manifest
+            
+        Returns:
+            List of orphaned XML file paths
+        """
+        return self._collect_orphaned_files(referenced_files)['xml']
+    
     def parse_orphaned_xml(self, xml_file: Path) -> Optional[CanvasPage]:
         """
         Parse an orphaned XML file and convert to CanvasPage.
@@ -239,69 +295,49 @@ class OrphanedContentHandler:
     
     def process_all_orphaned_content(
         self,
-        referenced_files: set
+        referenced_files: set,
+        orphaned_files: Optional[List[str]] = None
     ) -> List[CanvasPage]:
         """
         Process all orphaned content files.
         
         Args:
             referenced_files: Set of files referenced in manifest
+            orphaned_files: Unreferenced files already found by the Validator
+                (relative paths), used instead of walking the directory
             
         Returns:
             List of CanvasPage objects created from orphaned content
         """
         pages = []
         
-        # Find and process orphaned XML files
-        orphaned_xml = self.find_orphaned_xml_files(referenced_files)
-        
-        print(f"  Found {len(orphaned_xml)} orphaned XML files")
+        # One walk over the tree (or the Validator's list), then convert each group in turn
+        orphaned = self._collect_orphaned_files(referenced_files, orphaned_files)
+        converters = {
+            'xml': self.parse_orphaned_xml,
+            'html': self.parse_orphaned_html,
+        }
+        converted = {ext: 0 for ext in ORPHAN_EXTENSIONS}
         
-        for xml_file in orphaned_xml:
-            page = self.parse_orphaned_xml(xml_file)
-            if page:
-                pages.append(page)
-                print(f"  [OK] Converted orphaned XML: {xml_file.name}")
+        logger.debug("Found orphaned files", extra={ext: len(files) for ext, files in orphaned.items()})
         
-        # Find orphaned HTML files
-        for html_file in self.course_directory.rglob("*.html"):
-            if 'tutor_lms_output' in str(html_file):
-                continue
-            
-            try:
-                rel_path = str(html_file.relative_to(self.course_directory))
-            except ValueError:
-                continue
-            
-            if rel_path not in referenced_files:
-                page = self.parse_orphaned_html(html_file)
-                if page:
-                    pages.append(page)
-                    print(f"  [OK] Converted orphaned HTML: {html_file.name}")
-
-        # Find orphaned PPTX files
-        for pptx_file in self.course_directory.rglob("*.pptx"):
-            if 'tutor_lms_output' in str(pptx_file):
-                continue
-            
-            try:
-                rel_path = str(pptx_file.relative_to(self.course_directory))
-                # Normalize path separators
-                rel_path = rel_path.replace('\\', '/')
-            except ValueError:
-                continue
-            
-            # Check against referenced files (which might use forward slashes)
-            is_referenced = False
-            for ref in referenced_files:
-                if ref and ref.replace('\\', '/') == rel_path:
-                    is_referenced = True
-                    break
-            
-            if not is_referenced:
-                page = self.pptx_parser.parse_pptx(pptx_file, identifier=f"orphaned_{pptx_file.stem}")
+        for ext, convert in converters.items():
+            for file_path in orphaned[ext]:
+                page = convert(file_path)
                 if page:
                     pages.append(page)
-                    print(f"  [OK] Converted orphaned PPTX: {pptx_file.name}")
+                    converted[ext] += 1
+                    logger.debug("Converted orphaned file", extra={"path": file_path.name})
+        
+        # Decks convert in worker processes (see PptxParser.parse_pptx_files)
+        pptx_tasks = [(pptx_file, f"orphaned_{pptx_file.stem}") for pptx_file in orphaned['pptx']]
+        pptx_pages = self.pptx_parser.parse_pptx_files(pptx_tasks)
+        pages.extend(pptx_pages)
+        converted['pptx'] = len(pptx_pages)
+        
+        logger.info(
+            f"Converted {converted['xml']} XML, {converted['html']} HTML, "
+            f"{converted['pptx']} PPTX orphaned files"
+        )
         
         return pages
@@ -4,14 +4,45 @@ Page Parser - Parses Canvas wiki pages.
 Extracts page content from wiki_content/*.xml files.
 """
 
+import os
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 
+from lxml import etree
+
 from models.canvas_models import CanvasPage, WorkflowState
 from models.migration_report import MigrationError, ErrorSeverity
 from utils.xml_utils import parse_xml_file, find_element, get_element_text
 from utils.html_utils import clean_html, get_inner_html
+from utils.parallel import WorkerPool, process_map
+
+# A page parses in ~0.3 ms against ~200 ms to start worker processes
+# (scripts/benchmark_parallel.py), so only very large wikis use a pool
+PAGE_PARALLEL_MIN_ITEMS = 800
+
+# Precompiled XPath queries run once per page file
+_XP_TITLE = etree.XPath('.//title')
+_XP_WORKFLOW_STATE = etree.XPath('.//workflow_state')
+
+# Non-default workflow_state values (anything else is active)
+_WORKFLOW_MAP = {
+    'unpublished': WorkflowState.UNPUBLISHED,
+    'deleted': WorkflowState.DELETED,
+}
+
+
+def _parse_page_file(
+    course_directory: Path,
+    page_file: Path
+) -> tuple[Optional[CanvasPage], List[MigrationError]]:
+    """Parse one wiki_content file (XML or HTML); process-pool worker."""
+    parser = PageParser(course_directory)
+    if page_file.suffix == '.xml':
+        page = parser.parse_page(page_file)
+    else:
+        page = parser.parse_html_page(page_file)
+    return page, parser.errors
 
 
 class PageParser:
@@ -19,14 +50,16 @@ class PageParser:
     Parses Canvas page XML files.
     """
     
-    def __init__(self, course_directory: Path):
+    def __init__(self, course_directory: Path, worker_pool: Optional[WorkerPool] = None):
         """
         Initialize page parser.
         
         Args:
             course_directory: Path to Canvas course export directory
+            worker_pool: Process pool shared with the other parsers of a stage
         """
         self.course_directory = course_directory
+        self.worker_pool = worker_pool
         self.wiki_content_dir = course_directory / "wiki_content"
         self.errors: List[MigrationError] = []
     
@@ -77,21 +110,24 @@ class PageParser:
     
     def _extract_title(self, root, page_file: Path) -> str:
         """Extract page title"""
-        title_elem = find_element(root, './/title', {})
+        title_elem = find_element(root, _XP_TITLE)
         if title_elem is not None:
             return get_element_text(title_elem, page_file.stem)
         return page_file.stem
     
     def _extract_body(self, root) -> str:
         """Extract page body HTML"""
-        body_elem = find_element(root, './/body', {})
-        if body_elem is not None:
-            # Get inner HTML
-            body_html = get_inner_html(body_elem)
-            return clean_html(body_html)
+        # One descendant walk: stop at the first <body>, remembering the
+        # first <text> as the fallback
+        text_elem = None
+        for elem in root.iterdescendants('body', 'text'):
+            if elem.tag == 'body':
+                # Get inner HTML
+                return clean_html(get_inner_html(elem))
+            if text_elem is None:
+                text_elem = elem
         
         # Fallback: try text element
-        text_elem = find_element(root, './/text', {})
         if text_elem is not None:
             return clean_html(get_element_text(text_elem, ""))
         
@@ -99,13 +135,13 @@ class PageParser:
     
     def _extract_workflow_state(self, root) -> WorkflowState:
         """Extract workflow state"""
-        state_elem = find_element(root, './/workflow_state', {})
+        state_elem = find_element(root, _XP_WORKFLOW_STATE)
         if state_elem is not None:
-            state_text = get_element_text(state_elem, "active").lower()
-            if state_text == "unpublished":
-                return WorkflowState.UNPUBLISHED
-            elif state_text == "deleted":
-                return WorkflowState.DELETED
+            state_text = get_element_text(state_elem, "active")
+            # Canvas writes lowercase states; only fold case when needed
+            if not state_text.islower():
+                state_text = state_text.lower()
+            return _WORKFLOW_MAP.get(state_text, WorkflowState.ACTIVE)
         return WorkflowState.ACTIVE
     
     def parse_html_page(self, html_file: Path) -> Optional[CanvasPage]:
@@ -141,13 +177,26 @@ class PageParser:
         if not self.wiki_content_dir.exists():
             return pages
 
-        for page_file in self.wiki_content_dir.glob("*.xml"):
-            page = self.parse_page(page_file)
-            if page:
-                pages.append(page)
+        # One scandir pass; XML pages are parsed before HTML pages
+        xml_files: List[Path] = []
+        html_files: List[Path] = []
+        with os.scandir(self.wiki_content_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith('.xml'):
+                    xml_files.append(Path(entry.path))
+                elif entry.name.endswith('.html'):
+                    html_files.append(Path(entry.path))
+        page_files = xml_files + html_files
 
-        for page_file in self.wiki_content_dir.glob("*.html"):
-            page = self.parse_html_page(page_file)
+        # Files are independent, so large wikis are parsed in worker processes
+        results = process_map(
+            _parse_page_file, page_files, self.course_directory,
+            min_items=PAGE_PARALLEL_MIN_ITEMS, pool=self.worker_pool
+        )
+        for page, errors in results:
+            self.errors.extend(errors)
             if page:
                 pages.append(page)
 
@@ -6,13 +6,75 @@ Also auto-generates a cover thumbnail from the first slide so the
 ingestion report no longer flags these decks as missing thumbnails.
 """
 
+import html
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from pptx import Presentation
 
 from models.canvas_models import CanvasPage, WorkflowState
 from models.migration_report import MigrationError, ErrorSeverity
-from utils.html_utils import clean_html
+from utils.parallel import WorkerPool, process_map
+
+# A 30-slide deck converts in ~55 ms against ~200 ms to start worker
+# processes (scripts/benchmark_parallel.py)
+PPTX_PARALLEL_MIN_ITEMS = 4
+
+# Per-slide HTML templates
+_SLIDE_OPEN = (
+    '<div class="ppt-slide" id="slide-%d" '
+    'style="margin-bottom:30px;border:1px solid #eee;padding:20px;">'
+)
+_NOTES_TMPL = (
+    '<div class="ppt-notes" style="background:#f9f9f9;padding:10px;'
+    'margin-top:10px;font-size:0.9em;color:#666;">'
+    '<strong>Notes:</strong> %s</div>'
+)
+
+# Single, safe slide-tracking script appended to every converted deck.
+# Works in both iframe and standalone contexts.
+_TRACKING_SCRIPT = '''<script>
+document.addEventListener('DOMContentLoaded', function() {
+    var slides = document.querySelectorAll('.ppt-slide');
+    var totalSlides = slides.length;
+    var viewedSlides = new Set();
+
+    function postToParent(msg) {
+        if (window.parent && window.parent !== window) {
+            window.parent.postMessage(msg, '*');
+        }
+    }
+
+    postToParent({ type: 'PRESENTATION_INIT', slideCount: totalSlides, source: 'pptx' });
+
+    var observer = new IntersectionObserver(function(entries) {
+        entries.forEach(function(entry) {
+            if (!entry.isIntersecting) return;
+            var id = entry.target.id;
+            if (viewedSlides.has(id)) return;
+            viewedSlides.add(id);
+            var idx = parseInt(id.replace('slide-', ''));
+            var progress = Math.round((viewedSlides.size / totalSlides) * 100);
+            postToParent({ type: 'SLIDE_VIEWED', slideId: id, slideIndex: idx, progress: progress, source: 'pptx' });
+            if (viewedSlides.size === totalSlides) {
+                postToParent({ type: 'PRESENTATION_COMPLETE', totalSlides: totalSlides, source: 'pptx' });
+            }
+        });
+    }, { threshold: 0.5 });
+
+    slides.forEach(function(s) { observer.observe(s); });
+});
+</script>'''
+
+
+def _parse_pptx_file(
+    course_directory: Path,
+    task: Tuple[Path, Optional[str]]
+) -> Tuple[Optional[CanvasPage], List[MigrationError]]:
+    """Convert one (file_path, identifier) deck; process-pool worker."""
+    parser = PptxParser(course_directory)
+    file_path, identifier = task
+    page = parser.parse_pptx(file_path, identifier=identifier)
+    return page, parser.errors
 
 
 class PptxParser:
@@ -22,8 +84,9 @@ class PptxParser:
     saved alongside the source file, eliminating missing-thumbnail warnings.
     """
 
-    def __init__(self, course_directory: Path):
+    def __init__(self, course_directory: Path, worker_pool: Optional[WorkerPool] = None):
         self.course_directory = course_directory
+        self.worker_pool = worker_pool
         self.errors: List[MigrationError] = []
 
     def parse_pptx(self, file_path: Path, identifier: str = None) -> Optional[CanvasPage]:
@@ -61,6 +124,27 @@ class PptxParser:
             ))
             return None
 
+    def parse_pptx_files(self, tasks: List[Tuple[Path, Optional[str]]]) -> List[CanvasPage]:
+        """
+        Convert several decks, in worker processes when there are enough of them.
+
+        Args:
+            tasks: (file_path, identifier) pairs, as for parse_pptx
+
+        Returns:
+            Converted pages, in task order (failed decks are skipped)
+        """
+        pages = []
+        results = process_map(
+            _parse_pptx_file, tasks, self.course_directory,
+            min_items=PPTX_PARALLEL_MIN_ITEMS, pool=self.worker_pool
+        )
+        for page, errors in results:
+            self.errors.extend(errors)
+            if page:
+                pages.append(page)
+        return pages
+
     def _extract_cover_thumbnail(self, prs, file_path: Path) -> Optional[Path]:
         """
         Render the first slide to a PNG thumbnail using Pillow.
@@ -100,16 +184,17 @@ class PptxParser:
                 body_font  = title_font
 
             # Draw slide title in header bar
-            title_text = ""
-            if slide.shapes.title and slide.shapes.title.text.strip():
-                title_text = slide.shapes.title.text.strip()
+            shapes = slide.shapes
+            title_shape = shapes.title
+            title_text = title_shape.text.strip() if title_shape is not None else ""
             if title_text:
                 draw.text((40, height_px // 10), title_text, fill=(255, 255, 255), font=title_font)
 
             # Draw first few body lines below the header
             y = height_px // 5 + 30
-            for shape in slide.shapes:
-                if shape == slide.shapes.title:
+            for shape in shapes:
+                # python-pptx builds a new proxy per access, so compare with ==
+                if shape == title_shape:
                     continue
                 if hasattr(shape, "text") and shape.text.strip():
                     for line in shape.text.strip().splitlines()[:6]:
@@ -139,79 +224,46 @@ class PptxParser:
 
     def _convert_presentation_to_html(self, prs) -> str:
         """Convert presentation slides to a single HTML string."""
-        html_parts = ['<div class="ppt-presentation">']
+        return ''.join(self._iter_html(prs))
+
+    def _iter_html(self, prs) -> Iterator[str]:
+        """Yield the presentation HTML as newline-terminated fragments."""
+        yield '<div class="ppt-presentation">\n'
 
         for i, slide in enumerate(prs.slides):
-            html_parts.append(
-                f'<div class="ppt-slide" id="slide-{i+1}" '
-                f'style="margin-bottom:30px;border:1px solid #eee;padding:20px;">'
-            )
+            yield _SLIDE_OPEN % (i + 1) + '\n'
 
-            # Title
-            if slide.shapes.title and slide.shapes.title.text.strip():
-                html_parts.append(f'<h2>{clean_html(slide.shapes.title.text)}</h2>')
+            # Title (looked up once: each access rescans the placeholders)
+            shapes = slide.shapes
+            title_shape = shapes.title
+            title_text = title_shape.text.strip() if title_shape is not None else ""
+            if title_text:
+                yield f'<h2>{html.escape(title_text)}</h2>\n'
 
-            # Body shapes
-            for shape in slide.shapes:
-                if shape == slide.shapes.title:
+            # Body shapes (plain text: escaped, not run through the HTML cleaner)
+            for shape in shapes:
+                # python-pptx builds a new proxy per access, so compare with ==
+                if shape == title_shape:
                     continue
-                if not (hasattr(shape, "text") and shape.text.strip()):
+                text = html.escape(shape.text.strip()) if hasattr(shape, "text") else ""
+                if not text:
                     continue
-                text = clean_html(shape.text)
                 if '\n' in text:
-                    items = [l.strip() for l in text.split('\n') if l.strip()]
-                    html_parts.append('<ul>')
-                    html_parts.extend(f'<li>{item}</li>' for item in items)
-                    html_parts.append('</ul>')
+                    items = [line for line in map(str.strip, text.split('\n')) if line]
+                    yield '<ul>%s</ul>\n' % ''.join(['<li>%s</li>' % item for item in items])
                 else:
-                    html_parts.append(f'<p>{text}</p>')
+                    yield f'<p>{text}</p>\n'
 
             # Speaker notes
-            if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
-                notes = slide.notes_slide.notes_text_frame.text.strip()
+            notes_frame = slide.notes_slide.notes_text_frame if slide.has_notes_slide else None
+            if notes_frame:
+                notes = notes_frame.text.strip()
                 if notes:
-                    html_parts.append(
-                        f'<div class="ppt-notes" style="background:#f9f9f9;padding:10px;'
-                        f'margin-top:10px;font-size:0.9em;color:#666;">'
-                        f'<strong>Notes:</strong> {clean_html(notes)}</div>'
-                    )
-
-            html_parts.append('</div><hr>')
-
-        html_parts.append('</div>')
-
-        # Single, safe tracking script — works in both iframe and standalone contexts
-        html_parts.append('''<script>
-document.addEventListener('DOMContentLoaded', function() {
-    var slides = document.querySelectorAll('.ppt-slide');
-    var totalSlides = slides.length;
-    var viewedSlides = new Set();
+                    yield _NOTES_TMPL % html.escape(notes) + '\n'
 
-    function postToParent(msg) {
-        if (window.parent && window.parent !== window) {
-            window.parent.postMessage(msg, '*');
-        }
-    }
-
-    postToParent({ type: 'PRESENTATION_INIT', slideCount: totalSlides, source: 'pptx' });
+            yield '</div><hr>\n'
 
-    var observer = new IntersectionObserver(function(entries) {
-        entries.forEach(function(entry) {
-            if (!entry.isIntersecting) return;
-            var id = entry.target.id;
-            if (viewedSlides.has(id)) return;
-            viewedSlides.add(id);
-            var idx = parseInt(id.replace('slide-', ''));
-            var progress = Math.round((viewedSlides.size / totalSlides) * 100);
-            postToParent({ type: 'SLIDE_VIEWED', slideId: id, slideIndex: idx, progress: progress, source: 'pptx' });
-            if (viewedSlides.size === totalSlides) {
-                postToParent({ type: 'PRESENTATION_COMPLETE', totalSlides: totalSlides, source: 'pptx' });
-            }
-        });
-    }, { threshold: 0.5 });
-
-    slides.forEach(function(s) { observer.observe(s); });
-});
-</script>''')
+        yield '</div>\n'
 
-        return '\n'.join(html_parts)
+        # Slide-view tracking for the LMS player
+        yield _TRACKING_SCRIPT
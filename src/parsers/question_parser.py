@@ -4,8 +4,11 @@ Question Parser - Parses Canvas quiz questions (QTI-compliant).
 Handles all Canvas question types with proper QTI parsing.
 """
 
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
+
+from lxml import etree
 
 from models.canvas_models import (
     CanvasQuestion,
@@ -13,9 +16,60 @@ from models.canvas_models import (
     QuestionType
 )
 from models.migration_report import MigrationError, ErrorSeverity
-from utils.xml_utils import parse_xml_file, find_element, find_elements, get_element_text, get_element_attribute, get_inner_html
+from utils.xml_utils import get_element_text, get_element_attribute, get_inner_html
 from utils.html_utils import clean_html
 
+# XML files in a quiz directory that are not questions
+_NON_QUESTION_FILES = frozenset({"assessment_meta.xml", "assessment.xml", "assignment_settings.xml"})
+
+# Elements collected while sweeping a question file. Path-qualified lookups
+# (presentation//material, response_lid//response_label, correctResponse//value)
+# are resolved from their collected ancestor.
+_QUESTION_TAGS = (
+    'title',
+    'itemBody',
+    'presentation',
+    'question_text',
+    'question_type',
+    'responseDeclaration',
+    'maxScore',
+    'points_possible',
+    'simpleChoice',
+    'response_lid',
+    'response_choice',
+    'correctResponse',
+    'respcondition',
+    'generalFeedback',
+    'modalFeedback',
+)
+
+# Canvas question_type values -> QuestionType (unknown types become essays)
+_QTYPE_MAP = {
+    'multiple_choice_question': QuestionType.MULTIPLE_CHOICE,
+    'true_false_question': QuestionType.TRUE_FALSE,
+    'essay_question': QuestionType.ESSAY,
+    'short_answer_question': QuestionType.SHORT_ANSWER,
+    'fill_in_multiple_blanks_question': QuestionType.FILL_IN_BLANK,
+    'matching_question': QuestionType.MATCHING,
+    'numerical_question': QuestionType.NUMERICAL,
+    'calculated_question': QuestionType.CALCULATED,
+    'multiple_answers_question': QuestionType.MULTIPLE_ANSWERS,
+    'file_upload_question': QuestionType.FILE_UPLOAD,
+    'text_only_question': QuestionType.TEXT_ONLY,
+    'ordering_question': QuestionType.ORDERING,
+}
+
+
+def _first(found: Dict[str, List[etree._Element]], tag: str) -> Optional[etree._Element]:
+    """Return the first collected element with the given tag, or None."""
+    elements = found.get(tag)
+    return elements[0] if elements else None
+
+
+def _first_descendant(element: etree._Element, tag: str) -> Optional[etree._Element]:
+    """Return the first descendant of element with the given tag, or None."""
+    return next(element.iterdescendants(tag), None)
+
 
 class QuestionParser:
     """
@@ -45,11 +99,19 @@ class QuestionParser:
         questions = []
         
         # Look for question XML files
-        for xml_file in quiz_dir.glob("*.xml"):
-            if xml_file.name in ("assessment_meta.xml", "assessment.xml", "assignment_settings.xml"):
-                continue
-            
-            question = self.parse_question(xml_file)
+        with os.scandir(quiz_dir) as entries:
+            question_files = [
+                Path(entry.path) for entry in entries
+                if entry.name.endswith('.xml')
+                and entry.name not in _NON_QUESTION_FILES
+                and entry.is_file()
+            ]
+        
+        # Parsed in-process: a question file takes ~0.2 ms, so even a large
+        # quiz finishes long before a worker pool could start (~200 ms).
+        # Quizzes themselves are spread over worker processes instead.
+        for question_file in question_files:
+            question = self.parse_question(question_file)
             if question:
                 questions.append(question)
         
@@ -66,28 +128,26 @@ class QuestionParser:
             CanvasQuestion object or None if parsing fails
         """
         try:
-            root = parse_xml_file(question_file)
-            if root is None:
-                return None
+            root, found = self._sweep_question_file(question_file)
             
             # Extract question metadata
             identifier = get_element_attribute(root, 'identifier', question_file.stem)
-            title = get_element_text(find_element(root, './/title', {}), "Question")
+            title = get_element_text(_first(found, 'title'), "Question")
             
             # Extract question text
-            question_text = self._extract_question_text(root)
+            question_text = self._extract_question_text(found)
             
             # Determine question type
-            question_type = self._determine_question_type(root)
+            question_type = self._determine_question_type(found)
             
             # Extract points
-            points = self._extract_points(root)
+            points = self._extract_points(found)
             
             # Extract answers
-            answers = self._extract_answers(root, question_type)
+            answers = self._extract_answers(found, question_type)
             
             # Extract feedback
-            general_feedback = self._extract_feedback(root)
+            general_feedback = self._extract_feedback(found)
             
             question = CanvasQuestion(
                 identifier=identifier,
@@ -111,52 +171,79 @@ class QuestionParser:
             ))
             return None
     
-    def _extract_question_text(self, root) -> str:
+    def _sweep_question_file(
+        self,
+        question_file: Path
+    ) -> tuple[etree._Element, Dict[str, List[etree._Element]]]:
+        """
+        Parse a question file in a single iterparse sweep.
+        
+        Every element named in _QUESTION_TAGS is collected (in document order)
+        as it completes, so the extractors below need no further tree searches.
+        Elements are not cleared: itemBody's inner HTML includes nested choices.
+        
+        Args:
+            question_file: Path to question XML file
+            
+        Returns:
+            Tuple of (root element, tag -> collected elements)
+        """
+        found: Dict[str, List[etree._Element]] = {}
+        context = etree.iterparse(
+            str(question_file),
+            events=('end',),
+            tag=_QUESTION_TAGS,
+            remove_blank_text=True,
+            # Same hardening as utils.xml_utils: no DTDs, entities or network
+            resolve_entities=False,
+            load_dtd=False,
+            no_network=True
+        )
+        for _, elem in context:
+            found.setdefault(elem.tag, []).append(elem)
+        
+        # Queries are descendant-only (.//tag): never match the root itself
+        root = context.root
+        if found.get(root.tag):
+            found[root.tag].remove(root)
+        
+        return root, found
+    
+    def _extract_question_text(self, found: Dict[str, List[etree._Element]]) -> str:
         """Extract question text/prompt"""
         # Try itemBody first (QTI standard)
-        item_body = find_element(root, './/itemBody', {})
+        item_body = _first(found, 'itemBody')
         if item_body is not None:
             return clean_html(get_inner_html(item_body))
         
         # Fallback to presentation/material
-        material = find_element(root, './/presentation//material', {})
-        if material is not None:
-            return clean_html(get_inner_html(material))
+        for presentation in found.get('presentation', ()):
+            material = _first_descendant(presentation, 'material')
+            if material is not None:
+                return clean_html(get_inner_html(material))
         
         # Fallback to question_text
-        question_text = find_element(root, './/question_text', {})
+        question_text = _first(found, 'question_text')
         if question_text is not None:
             return clean_html(get_element_text(question_text, ""))
         
         return ""
     
-    def _determine_question_type(self, root) -> QuestionType:
+    def _determine_question_type(self, found: Dict[str, List[etree._Element]]) -> QuestionType:
         """Determine question type from XML structure"""
         # Check for question_type element
-        type_elem = find_element(root, './/question_type', {})
+        type_elem = _first(found, 'question_type')
         if type_elem is not None:
-            type_text = get_element_text(type_elem, "").lower()
+            type_text = get_element_text(type_elem, "")
+            # Canvas writes lowercase type names; only fold case when needed
+            if not type_text.islower():
+                type_text = type_text.lower()
             
             # Map to QuestionType enum
-            type_mapping = {
-                'multiple_choice_question': QuestionType.MULTIPLE_CHOICE,
-                'true_false_question': QuestionType.TRUE_FALSE,
-                'essay_question': QuestionType.ESSAY,
-                'short_answer_question': QuestionType.SHORT_ANSWER,
-                'fill_in_multiple_blanks_question': QuestionType.FILL_IN_BLANK,
-                'matching_question': QuestionType.MATCHING,
-                'numerical_question': QuestionType.NUMERICAL,
-                'calculated_question': QuestionType.CALCULATED,
-                'multiple_answers_question': QuestionType.MULTIPLE_ANSWERS,
-                'file_upload_question': QuestionType.FILE_UPLOAD,
-                'text_only_question': QuestionType.TEXT_ONLY,
-                'ordering_question': QuestionType.ORDERING,
-            }
-            
-            return type_mapping.get(type_text, QuestionType.ESSAY)
+            return _QTYPE_MAP.get(type_text, QuestionType.ESSAY)
         
         # Infer from response type
-        response_decl = find_element(root, './/responseDeclaration', {})
+        response_decl = _first(found, 'responseDeclaration')
         if response_decl is not None:
             cardinality = get_element_attribute(response_decl, 'cardinality', 'single')
             if cardinality == 'multiple':
@@ -166,10 +253,10 @@ class QuestionParser:
         
         return QuestionType.ESSAY
     
-    def _extract_points(self, root) -> float:
+    def _extract_points(self, found: Dict[str, List[etree._Element]]) -> float:
         """Extract points possible"""
         # Try maxScore
-        max_score = find_element(root, './/maxScore', {})
+        max_score = _first(found, 'maxScore')
         if max_score is not None:
             try:
                 return float(get_element_text(max_score, "1"))
@@ -177,7 +264,7 @@ class QuestionParser:
                 pass
         
         # Try points_possible
-        points_elem = find_element(root, './/points_possible', {})
+        points_elem = _first(found, 'points_possible')
         if points_elem is not None:
             try:
                 return float(get_element_text(points_elem, "1"))
@@ -186,7 +273,11 @@ class QuestionParser:
         
         return 1.0
     
-    def _extract_answers(self, root, question_type: QuestionType) -> List[CanvasQuestionAnswer]:
+    def _extract_answers(
+        self,
+        found: Dict[str, List[etree._Element]],
+        question_type: QuestionType
+    ) -> List[CanvasQuestionAnswer]:
         """Extract answer choices"""
         answers = []
         
@@ -195,21 +286,31 @@ class QuestionParser:
             return answers
         
         # Find response choices (QTI 2.x)
-        choices = find_elements(root, './/simpleChoice', {})
+        choices = found.get('simpleChoice', [])
         
         # If not found, try response_lid/render_choice (QTI 1.2 - common in Canvas)
         if not choices:
-            choices = find_elements(root, './/response_lid//response_label', {})
+            choices = [
+                label
+                for response_lid in found.get('response_lid', ())
+                for label in response_lid.iterdescendants('response_label')
+            ]
         
         # If still not found, try response_choice
         if not choices:
-            choices = find_elements(root, './/response_choice', {})
+            choices = found.get('response_choice', [])
+        
+        if not choices:
+            return answers
+        
+        # Correct answer ids, computed once per question (weight = 100)
+        correct_ids = self._get_correct_ids(found)
         
         for choice in choices:
             answer_id = get_element_attribute(choice, 'identifier') or get_element_attribute(choice, 'ident', '')
             
             # Extract text from material/mattext (QTI 1.2) or inner HTML (QTI 2.x)
-            mattext = find_element(choice, './/mattext', {})
+            mattext = _first_descendant(choice, 'mattext')
             if mattext is not None:
                 answer_text = clean_html(get_element_text(mattext, ""))
             else:
@@ -217,46 +318,43 @@ class QuestionParser:
             
             if not answer_text and not answer_id:
                 continue
-
-            # Determine if correct (weight = 100)
-            weight = self._get_answer_weight(root, answer_id)
             
             answer = CanvasQuestionAnswer(
                 id=answer_id,
                 text=answer_text or answer_id,
-                weight=weight
+                weight=100.0 if answer_id in correct_ids else 0.0
             )
             answers.append(answer)
         
         return answers
     
-    def _get_answer_weight(self, root, answer_id: str) -> float:
-        """Get weight/score for an answer"""
+    def _get_correct_ids(self, found: Dict[str, List[etree._Element]]) -> Set[str]:
+        """Collect the identifiers of all correct answers"""
+        correct_ids = set()
+        
         # Look in responseProcessing for correct answer (QTI 2.x)
-        correct_responses = find_elements(root, './/correctResponse//value', {})
-        for correct_resp in correct_responses:
-            if get_element_text(correct_resp, '') == answer_id:
-                return 100.0
+        for correct_response in found.get('correctResponse', ()):
+            for value in correct_response.iterdescendants('value'):
+                correct_ids.add(get_element_text(value, ''))
         
         # Look in respcondition (QTI 1.2)
-        resp_conditions = find_elements(root, './/respcondition', {})
-        for cond in resp_conditions:
-            setvar = find_element(cond, './/setvar', {})
+        for cond in found.get('respcondition', ()):
+            setvar = _first_descendant(cond, 'setvar')
             if setvar is not None and get_element_text(setvar, '0') == '100':
-                varequal = find_element(cond, './/varequal', {})
-                if varequal is not None and get_element_text(varequal, '') == answer_id:
-                    return 100.0
+                varequal = _first_descendant(cond, 'varequal')
+                if varequal is not None:
+                    correct_ids.add(get_element_text(varequal, ''))
         
-        return 0.0
+        return correct_ids
     
-    def _extract_feedback(self, root) -> Optional[str]:
+    def _extract_feedback(self, found: Dict[str, List[etree._Element]]) -> Optional[str]:
         """Extract general feedback"""
-        feedback_elem = find_element(root, './/generalFeedback', {})
+        feedback_elem = _first(found, 'generalFeedback')
         if feedback_elem is not None:
             return clean_html(get_inner_html(feedback_elem))
         
         # Try modalFeedback
-        modal_feedback = find_element(root, './/modalFeedback', {})
+        modal_feedback = _first(found, 'modalFeedback')
         if modal_feedback is not None:
             return clean_html(get_inner_html(modal_feedback))
         
@@ -4,53 +4,122 @@ Quiz Parser - Parses Canvas quizzes/assessments.
 Extracts quiz data from assessment XML files.
 """
 
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Set
 from datetime import datetime
 
+from lxml import etree
+
 from models.canvas_models import CanvasQuiz, WorkflowState
 from models.migration_report import MigrationError, ErrorSeverity
 from utils.xml_utils import parse_xml_file, find_element, find_elements, get_element_text, get_element_attribute
 from utils.html_utils import clean_html
+from utils.parallel import WorkerPool, process_map
+from config.canvas_schemas import CANVAS_NAMESPACES
 from .question_parser import QuestionParser
 
+# A quiz (with its questions) parses in ~3-5 ms against ~200 ms to start
+# worker processes (scripts/benchmark_parallel.py)
+QUIZ_PARALLEL_MIN_ITEMS = 64
+
+# Precompiled XPath queries run once per assessment file
+_XP_TITLE = etree.XPath('.//title')
+_XP_CANVAS_TITLE = etree.XPath('.//canvas:title', namespaces=CANVAS_NAMESPACES)
+_XP_QUIZ_TYPE = etree.XPath('.//quiz_type')
+_XP_POINTS_POSSIBLE = etree.XPath('.//points_possible')
+_XP_ALLOWED_ATTEMPTS = etree.XPath('.//allowed_attempts')
+_XP_TIME_LIMIT = etree.XPath('.//time_limit')
+_XP_DESCRIPTION = {
+    tag_name: etree.XPath(f'.//{tag_name}')
+    for tag_name in ('description', 'rubric')
+}
+
+
+# Quiz metadata files, in order of preference
+ASSESSMENT_FILES = ("assessment_meta.xml", "assessment.xml")
+
+# Course-root folders that never hold quizzes
+_NON_QUIZ_DIRS = frozenset({
+    "non_cc_assessments", "wiki_content", "web_resources",
+    "course_settings", "lti_resource_links",
+})
+
+
+def _parse_quiz_file(
+    course_directory: Path,
+    assessment_file: Path
+) -> tuple[Optional[CanvasQuiz], List[MigrationError], List[MigrationError]]:
+    """Parse one quiz from its assessment file; process-pool worker. Returns quiz and question errors separately."""
+    parser = QuizParser(course_directory)
+    quiz = parser.parse_quiz(assessment_file.parent, assessment_file=assessment_file)
+    return quiz, parser.errors, parser.question_parser.errors
+
+
+def _scan_subdirectories(directory: Path) -> Iterator[os.DirEntry]:
+    """Yield the subdirectory entries of a directory (nothing if it doesn't exist)."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+def _list_file_names(directory: str) -> Set[str]:
+    """Return the names of all entries in a directory with a single scandir."""
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries}
+
 
 class QuizParser:
     """
     Parses Canvas quiz/assessment XML files.
     """
     
-    def __init__(self, course_directory: Path):
+    def __init__(self, course_directory: Path, worker_pool: Optional[WorkerPool] = None):
         """
         Initialize quiz parser.
         
         Args:
             course_directory: Path to Canvas course export directory
+            worker_pool: Process pool shared with the other parsers of a stage
         """
         self.course_directory = course_directory
+        self.worker_pool = worker_pool
         self.question_parser = QuestionParser(course_directory)
         self.errors: List[MigrationError] = []
     
-    def parse_quiz(self, quiz_dir: Path) -> Optional[CanvasQuiz]:
+    def parse_quiz(
+        self,
+        quiz_dir: Path,
+        assessment_file: Optional[Path] = None
+    ) -> Optional[CanvasQuiz]:
         """
         Parse a quiz from its directory.
         
         Args:
             quiz_dir: Path to quiz directory
+            assessment_file: Assessment XML already located by the caller
+                (skips probing quiz_dir for it)
             
         Returns:
             CanvasQuiz object or None if parsing fails
         """
-        # Look for assessment XML files
-        assessment_file = quiz_dir / "assessment_meta.xml"
-        if not assessment_file.exists():
-            assessment_file = quiz_dir / "assessment.xml"
-        
-        if not assessment_file.exists():
-            return None
+        # Try the assessment XML files in order; a missing file costs one failed open
+        candidates = (assessment_file,) if assessment_file else [quiz_dir / name for name in ASSESSMENT_FILES]
         
         try:
-            root = parse_xml_file(assessment_file)
+            for assessment_file in candidates:
+                try:
+                    root = parse_xml_file(assessment_file)
+                    break
+                except FileNotFoundError:
+                    continue
+            else:
+                return None
+            
             if root is None:
                 self.errors.append(MigrationError(
                     severity=ErrorSeverity.ERROR,
@@ -63,10 +132,10 @@ class QuizParser:
             # Extract quiz metadata
             title = self._extract_title(root, quiz_dir)
             description = self._extract_description(root)
-            quiz_type = get_element_text(find_element(root, './/quiz_type', {}), "assignment")
-            points_possible = float(get_element_text(find_element(root, './/points_possible', {}), "0"))
+            quiz_type = get_element_text(find_element(root, _XP_QUIZ_TYPE), "assignment")
+            points_possible = float(get_element_text(find_element(root, _XP_POINTS_POSSIBLE), "0"))
             time_limit = self._extract_time_limit(root)
-            allowed_attempts = int(get_element_text(find_element(root, './/allowed_attempts', {}), "1"))
+            allowed_attempts = int(get_element_text(find_element(root, _XP_ALLOWED_ATTEMPTS), "1"))
             
             # Parse questions
             questions = self.question_parser.parse_questions_from_quiz(quiz_dir)
@@ -98,12 +167,11 @@ class QuizParser:
     def _extract_title(self, root, quiz_dir: Path) -> str:
         """Extract quiz title — handles both namespaced and plain XML."""
         # Try plain (no namespace)
-        title_elem = find_element(root, './/title', {})
+        title_elem = find_element(root, _XP_TITLE)
         if title_elem is not None and title_elem.text:
             return title_elem.text.strip()
         # Try Canvas namespace
-        from config.canvas_schemas import CANVAS_NAMESPACES
-        title_elem = find_element(root, './/canvas:title', CANVAS_NAMESPACES)
+        title_elem = find_element(root, _XP_CANVAS_TITLE)
         if title_elem is not None and title_elem.text:
             return title_elem.text.strip()
         # Wildcard namespace fallback
@@ -117,7 +185,7 @@ class QuizParser:
         from utils.html_utils import clean_html
         import html
         for tag_name in ('description', 'rubric'):
-            desc_elem = find_element(root, f'.//{tag_name}', {})
+            desc_elem = find_element(root, _XP_DESCRIPTION[tag_name])
             if desc_elem is not None:
                 text = get_element_text(desc_elem, "")
                 return clean_html(html.unescape(text)) if text else ""
@@ -129,7 +197,7 @@ class QuizParser:
     
     def _extract_time_limit(self, root) -> Optional[int]:
         """Extract time limit in minutes"""
-        time_elem = find_element(root, './/time_limit', {})
+        time_elem = find_element(root, _XP_TIME_LIMIT)
         if time_elem is not None:
             try:
                 return int(get_element_text(time_elem, "0"))
@@ -146,30 +214,41 @@ class QuizParser:
             (Canvas exports QTI into resource-ID-named folders at the course root)
         """
         quizzes = []
+        assessment_files: List[Path] = []
         seen_dirs = set()
 
-        def _try_parse(quiz_dir: Path):
+        def _add(quiz_dir: str, names: Set[str]):
             if quiz_dir in seen_dirs:
                 return
             seen_dirs.add(quiz_dir)
-            quiz = self.parse_quiz(quiz_dir)
-            if quiz:
-                quizzes.append(quiz)
+            for name in ASSESSMENT_FILES:
+                if name in names:
+                    assessment_files.append(Path(quiz_dir) / name)
+                    return
+
+        # One scandir per candidate directory replaces per-file exists() probes
 
         # non_cc_assessments/ subdirectories
-        assessments_dir = self.course_directory / "non_cc_assessments"
-        if assessments_dir.exists():
-            for quiz_dir in assessments_dir.iterdir():
-                if quiz_dir.is_dir():
-                    _try_parse(quiz_dir)
+        for entry in _scan_subdirectories(self.course_directory / "non_cc_assessments"):
+            _add(entry.path, _list_file_names(entry.path))
 
         # Root-level subdirectories that contain QTI files
-        for item in self.course_directory.iterdir():
-            if not item.is_dir() or item.name in ("non_cc_assessments", "wiki_content",
-                                                    "web_resources", "course_settings",
-                                                    "lti_resource_links"):
+        for entry in _scan_subdirectories(self.course_directory):
+            if entry.name in _NON_QUIZ_DIRS:
                 continue
-            if (item / "assessment_meta.xml").exists() or (item / "assessment_qti.xml").exists():
-                _try_parse(item)
+            names = _list_file_names(entry.path)
+            if "assessment_meta.xml" in names or "assessment_qti.xml" in names:
+                _add(entry.path, names)
+
+        # Quiz directories are independent; many quizzes use worker processes
+        results = process_map(
+            _parse_quiz_file, assessment_files, self.course_directory,
+            min_items=QUIZ_PARALLEL_MIN_ITEMS, pool=self.worker_pool
+        )
+        for quiz, quiz_errors, question_errors in results:
+            self.errors.extend(quiz_errors)
+            self.question_parser.errors.extend(question_errors)
+            if quiz:
+                quizzes.append(quiz)
 
         return quizzes
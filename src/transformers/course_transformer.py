@@ -16,6 +16,17 @@ from observability.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Slug normalization, applied to every course, module item and lesson title
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEP_RE = re.compile(r'[-\s]+')
+
+# Curriculum item type -> TransformationReport counter, bumped as items are built
+_ITEM_COUNTERS = {
+    "Lesson": "lessons_created",
+    "Quiz": "quizzes_created",
+    "Assignment": "assignments_created",
+}
+
 
 class CourseTransformer:
     """
@@ -71,6 +82,7 @@ class CourseTransformer:
                 discussions_map, weblinks_map, report
             )
             lms_course.curriculum.append(lms_module)
+            report.modules_created += 1
 
         logger.info("[CourseTransformer] Transformation complete", extra={
             "modules": len(lms_course.curriculum),
@@ -103,6 +115,9 @@ class CourseTransformer:
             )
             if lms_item:
                 lms_module.items.append(lms_item)
+                counter = _ITEM_COUNTERS.get(lms_item.type)
+                if counter:
+                    setattr(report, counter, getattr(report, counter) + 1)
 
         return lms_module
 
@@ -131,7 +146,8 @@ class CourseTransformer:
         # Carry the content_ref onto the LMS item so AssetUploader can match it
         base_item._content_ref = lookup_key
 
-        if c_item.content_type == 'page':
+        content_type = c_item.content_type
+        if content_type == 'page':
             page = pages_map.get(lookup_key)
             base_item.type = "Lesson"
             if page:
@@ -140,7 +156,7 @@ class CourseTransformer:
             # and the AssetUploader will attach any file resources to it.
             return base_item
 
-        elif c_item.content_type == 'quiz':
+        elif content_type == 'quiz':
             quiz = quizzes_map.get(lookup_key)
             if quiz:
                 base_item.type = "Quiz"
@@ -158,12 +174,14 @@ class CourseTransformer:
                     attemptsAllowed=quiz.allowed_attempts,
                     showCorrectAnswers=quiz.show_correct_answers
                 )
+                report.questions_created += len(quiz.questions)
+                report.question_type_mappings.update(q.question_type.value for q in quiz.questions)
                 return base_item
             # Quiz declared in manifest but not parsed — keep as placeholder
             base_item.type = "Quiz"
             return base_item
 
-        elif c_item.content_type == 'assignment':
+        elif content_type == 'assignment':
             assign = assignments_map.get(lookup_key)
             if assign:
                 base_item.type = "Assignment"
@@ -177,14 +195,14 @@ class CourseTransformer:
             base_item.type = "Assignment"
             return base_item
 
-        elif c_item.content_type == 'discussion':
+        elif content_type == 'discussion':
             discussion = discussions_map.get(lookup_key)
             base_item.type = "Lesson"
             if discussion:
                 base_item.content = discussion.body
             return base_item
 
-        elif c_item.content_type == 'weblink':
+        elif content_type == 'weblink':
             weblink = weblinks_map.get(lookup_key)
             base_item.type = "Lesson"
             if weblink:
@@ -200,6 +218,5 @@ class CourseTransformer:
 
     def _slugify(self, text: str) -> str:
         """Standard slug generator."""
-        text = text.lower()
-        text = re.sub(r'[^\w\s-]', '', text)
-        return re.sub(r'[-\s]+', '-', text).strip('-')
+        text = _SLUG_STRIP_RE.sub('', text.lower())
+        return _SLUG_SEP_RE.sub('-', text).strip('-')
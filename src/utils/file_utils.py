@@ -4,11 +4,32 @@ File operation utilities with validation and safety checks.
 This module provides safe file operations for the migration pipeline.
 """
 
+import errno
+import fnmatch
 import hashlib
+import os
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Tuple
 
+# Extension groups (lowercase, without dot)
+HTML_EXTENSIONS = frozenset({'html', 'htm'})
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'webp'})
+VIDEO_EXTENSIONS = frozenset({'mp4', 'avi', 'mov', 'wmv', 'flv', 'webm', 'mkv'})
+DOCUMENT_EXTENSIONS = frozenset({'pdf', 'doc', 'docx', 'ppt', 'pptx'})
+
+# Read size for hashing when hashlib.file_digest (Python 3.11+) is unavailable
+HASH_CHUNK_SIZE = 1 << 20
+_file_digest = getattr(hashlib, 'file_digest', None)
+
+# copy_file_range errors meaning "not supported here" (old kernel, cross-device,
+# unsupported filesystem) rather than a real I/O failure
+_COPY_RANGE_UNSUPPORTED = frozenset({errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM})
+
+# Characters not allowed in filenames, each mapped to '_' by safe_filename
+_UNSAFE_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
 
 def validate_file_exists(file_path: Path) -> bool:
     """
@@ -46,6 +67,59 @@ def ensure_directory_exists(dir_path: Path) -> None:
     dir_path.mkdir(parents=True, exist_ok=True)
 
 
+def _fast_copy(source: Path, destination: Path) -> None:
+    """
+    Copy file contents and metadata, in-kernel where possible.
+    
+    Uses os.copy_file_range (Linux), which can reflink on btrfs/xfs. Falls back
+    to shutil.copyfile when it is unavailable, unsupported for this pair of
+    files, or copies nothing; raises if it stops partway through. Metadata is
+    then copied as shutil.copy2 would.
+    
+    Args:
+        source: Source file path
+        destination: Destination file path
+        
+    Raises:
+        shutil.SameFileError: If source and destination are the same file
+    """
+    # Checked before opening: 'wb' would truncate the source itself
+    if destination.exists() and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"{source} and {destination} are the same file")
+    
+    copied = False
+    if hasattr(os, 'copy_file_range'):
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            size = os.fstat(src.fileno()).st_size
+            remaining = size
+            try:
+                while remaining > 0:
+                    sent = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+            except OSError as e:
+                # Only fall back if nothing was written yet
+                if e.errno not in _COPY_RANGE_UNSUPPORTED or remaining < size:
+                    raise
+            else:
+                if remaining == 0:
+                    copied = True
+                elif remaining < size:
+                    # Source shrank or the kernel stopped mid-file
+                    raise OSError(
+                        f"copy_file_range stopped after {size - remaining} of "
+                        f"{size} bytes copying {source}"
+                    )
+                # Otherwise nothing was written (some filesystems, e.g. procfs,
+                # report 0 at once) and shutil.copyfile takes over below
+    
+    if not copied:
+        shutil.copyfile(source, destination)
+    
+    shutil.copystat(source, destination)
+
+
 def copy_file_safe(
     source: Path,
     destination: Path,
@@ -74,7 +148,7 @@ def copy_file_safe(
     ensure_directory_exists(destination.parent)
     
     try:
-        shutil.copy2(source, destination)
+        _fast_copy(source, destination)
         return True
     except Exception:
         return False
@@ -97,8 +171,11 @@ def get_file_hash(file_path: Path, algorithm: str = 'sha256') -> Optional[str]:
     hash_obj = hashlib.new(algorithm)
     
     try:
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
+        # Unbuffered: both paths read large blocks straight into the hasher
+        with open(file_path, 'rb', buffering=0) as f:
+            if _file_digest is not None:
+                return _file_digest(f, lambda: hash_obj).hexdigest()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
                 hash_obj.update(chunk)
         return hash_obj.hexdigest()
     except Exception:
@@ -150,6 +227,33 @@ def get_file_extension(file_path: Path) -> str:
     return file_path.suffix.lstrip('.').lower()
 
 
+@lru_cache(maxsize=None)
+def classify_extension(extension: str) -> str:
+    """
+    Classify a file extension (any case, without dot).
+    
+    Cached: a course only uses a handful of distinct extensions.
+    
+    Args:
+        extension: File extension (e.g., 'xml', 'PNG')
+        
+    Returns:
+        One of 'xml', 'html', 'image', 'video', 'document' or 'other'
+    """
+    extension = extension.lower()
+    if extension == 'xml':
+        return 'xml'
+    if extension in HTML_EXTENSIONS:
+        return 'html'
+    if extension in IMAGE_EXTENSIONS:
+        return 'image'
+    if extension in VIDEO_EXTENSIONS:
+        return 'video'
+    if extension in DOCUMENT_EXTENSIONS:
+        return 'document'
+    return 'other'
+
+
 def is_xml_file(file_path: Path) -> bool:
     """
     Check if file is an XML file based on extension.
@@ -173,8 +277,7 @@ def is_html_file(file_path: Path) -> bool:
     Returns:
         True if file has .html or .htm extension
     """
-    ext = get_file_extension(file_path)
-    return ext in ('html', 'htm')
+    return get_file_extension(file_path) in HTML_EXTENSIONS
 
 
 def is_image_file(file_path: Path) -> bool:
@@ -187,8 +290,7 @@ def is_image_file(file_path: Path) -> bool:
     Returns:
         True if file has image extension
     """
-    ext = get_file_extension(file_path)
-    return ext in ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'webp')
+    return get_file_extension(file_path) in IMAGE_EXTENSIONS
 
 
 def is_video_file(file_path: Path) -> bool:
@@ -201,8 +303,7 @@ def is_video_file(file_path: Path) -> bool:
     Returns:
         True if file has video extension
     """
-    ext = get_file_extension(file_path)
-    return ext in ('mp4', 'avi', 'mov', 'wmv', 'flv', 'webm', 'mkv')
+    return get_file_extension(file_path) in VIDEO_EXTENSIONS
 
 
 def find_files_recursive(
@@ -213,6 +314,9 @@ def find_files_recursive(
     """
     Recursively find files matching a pattern.
     
+    Excluded directories are pruned during the walk, so their contents are
+    never listed.
+    
     Args:
         directory: Directory to search
         pattern: Glob pattern (e.g., "*.xml")
@@ -221,19 +325,25 @@ def find_files_recursive(
     Returns:
         List of matching file paths
     """
-    if not validate_directory_exists(directory):
-        return []
-    
-    exclude_dirs = exclude_dirs or []
+    exclude = frozenset(exclude_dirs or ())
     files = []
+    stack = [str(directory)]
     
-    for item in directory.rglob(pattern):
-        # Skip if in excluded directory
-        if any(excluded in item.parts for excluded in exclude_dirs):
+    while stack:
+        # A missing or unreadable directory (including the root) is skipped,
+        # so the root needs no separate existence check
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
             continue
-        
-        if item.is_file():
-            files.append(item)
+        with entries:
+            for entry in entries:
+                if entry.name in exclude:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and fnmatch.fnmatchcase(entry.name, pattern):
+                    files.append(Path(entry.path))
     
     return files
 
@@ -266,8 +376,8 @@ def safe_filename(filename: str) -> str:
     Returns:
         Safe filename
     """
-    # Remove invalid characters
-    safe = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    # Replace invalid characters
+    safe = filename.translate(_UNSAFE_FILENAME_CHARS)
     
     # Remove leading/trailing spaces and dots
     safe = safe.strip('. ')
@@ -278,6 +388,3 @@ def safe_filename(filename: str) -> str:
         safe = name[:255 - len(ext) - 1] + '.' + ext if ext else name[:255]
     
     return safe
-
-
-import re  # Add this import at the top
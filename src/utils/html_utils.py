@@ -6,9 +6,58 @@ This module provides functions for cleaning, sanitizing, and manipulating HTML c
 
 import html
 import re
+import threading
 from typing import Optional, List
 from bs4 import BeautifulSoup
-import bleach
+from bleach.sanitizer import Cleaner
+from lxml import etree
+from lxml import html as lxml_html
+
+# $IMS-CC-FILEBASE$ asset references, plain or URL-encoded, in one pass
+_IMS_CC_RE = re.compile(r'(?:\$IMS-CC-FILEBASE\$|%24IMS-CC-FILEBASE%24)/([^"\')\s]+)')
+
+# HTML parser for get_body_content's fallback. Input is encoded to UTF-8 first
+# so that documents carrying an encoding declaration parse as well.
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# A literal <body> tag; lxml adds one to every document, so check the source
+_BODY_TAG_RE = re.compile(r'<body[\s/>]', re.IGNORECASE)
+
+# A complete <body>...</body> element, sliced out of well-formed documents as is
+_BODY_RE = re.compile(r'<body\b[^>]*>(.*?)</body\s*>', re.IGNORECASE | re.DOTALL)
+
+# Canvas internal links: /courses/{course_id}/modules/items/{item_id}
+# and /courses/{course_id}/pages/{page_slug}
+_MODULE_ITEM_LINK_RE = re.compile(r'/courses/\d+/modules/items/(\w+)')
+_PAGE_LINK_RE = re.compile(r'/courses/\d+/pages/(\w+)')
+
+# Default allowed tags for sanitize_html (safe for LMS content)
+DEFAULT_ALLOWED_TAGS = frozenset({
+    'a', 'abbr', 'acronym', 'b', 'blockquote', 'br', 'code', 'div',
+    'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img',
+    'li', 'ol', 'p', 'pre', 'span', 'strong', 'table', 'tbody',
+    'td', 'th', 'thead', 'tr', 'ul', 'iframe', 'video', 'audio',
+    'source', 'figure', 'figcaption'
+})
+
+# Default allowed attributes per tag for sanitize_html
+DEFAULT_ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title', 'target', 'rel'],
+    'img': ['src', 'alt', 'title', 'width', 'height'],
+    'iframe': ['src', 'width', 'height', 'frameborder', 'allowfullscreen'],
+    'video': ['src', 'controls', 'width', 'height'],
+    'audio': ['src', 'controls'],
+    'source': ['src', 'type'],
+    'div': ['class', 'id'],
+    'span': ['class', 'id'],
+    'p': ['class', 'id'],
+    'table': ['class', 'id'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan'],
+}
+
+# Default-config bleach Cleaner, one per thread (a Cleaner's parser is stateful)
+_cleaners = threading.local()
 
 
 def clean_html(content: str) -> str:
@@ -53,42 +102,28 @@ def sanitize_html(
     if not content:
         return ""
     
-    # Default allowed tags (safe for LMS content)
-    if allowed_tags is None:
-        allowed_tags = [
-            'a', 'abbr', 'acronym', 'b', 'blockquote', 'br', 'code', 'div',
-            'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img',
-            'li', 'ol', 'p', 'pre', 'span', 'strong', 'table', 'tbody',
-            'td', 'th', 'thead', 'tr', 'ul', 'iframe', 'video', 'audio',
-            'source', 'figure', 'figcaption'
-        ]
-    
-    # Default allowed attributes
-    if allowed_attributes is None:
-        allowed_attributes = {
-            'a': ['href', 'title', 'target', 'rel'],
-            'img': ['src', 'alt', 'title', 'width', 'height'],
-            'iframe': ['src', 'width', 'height', 'frameborder', 'allowfullscreen'],
-            'video': ['src', 'controls', 'width', 'height'],
-            'audio': ['src', 'controls'],
-            'source': ['src', 'type'],
-            'div': ['class', 'id'],
-            'span': ['class', 'id'],
-            'p': ['class', 'id'],
-            'table': ['class', 'id'],
-            'td': ['colspan', 'rowspan'],
-            'th': ['colspan', 'rowspan'],
-        }
-    
-    # Sanitize using bleach
-    sanitized = bleach.clean(
-        content,
-        tags=allowed_tags,
-        attributes=allowed_attributes,
+    # The default configuration reuses this thread's Cleaner
+    if allowed_tags is None and allowed_attributes is None:
+        return _default_cleaner().clean(content)
+    
+    cleaner = Cleaner(
+        tags=DEFAULT_ALLOWED_TAGS if allowed_tags is None else allowed_tags,
+        attributes=DEFAULT_ALLOWED_ATTRIBUTES if allowed_attributes is None else allowed_attributes,
         strip=True
     )
-    
-    return sanitized
+    return cleaner.clean(content)
+
+
+def _default_cleaner() -> Cleaner:
+    """Return the calling thread's Cleaner for the default sanitize_html config."""
+    cleaner = getattr(_cleaners, 'default', None)
+    if cleaner is None:
+        cleaner = _cleaners.default = Cleaner(
+            tags=DEFAULT_ALLOWED_TAGS,
+            attributes=DEFAULT_ALLOWED_ATTRIBUTES,
+            strip=True
+        )
+    return cleaner
 
 
 def extract_text_from_html(html_content: str) -> str:
@@ -135,23 +170,14 @@ def rewrite_canvas_asset_paths(content: str, base_path: str = "../web_resources/
     if not content:
         return ""
     
-    # print(f"DEBUG: Rewriting paths with base_path: {base_path}")
-    
-    # Replace $IMS-CC-FILEBASE$/ with actual path
-    content = re.sub(
-        r'\$IMS-CC-FILEBASE\$/([^"\')\s]+)',
-        rf'{base_path}\1',
-        content
-    )
-    
-    # Replace %24IMS-CC-FILEBASE%24/ (URL encoded version)
-    content = re.sub(
-        r'%24IMS-CC-FILEBASE%24/([^"\')\s]+)',
-        rf'{base_path}\1',
-        content
-    )
+    # Most content has no asset references; skip the regex engine entirely
+    # (the marker is also a substring of the URL-encoded form)
+    if 'IMS-CC-FILEBASE' not in content:
+        return content
     
-    return content
+    # Replace $IMS-CC-FILEBASE$/ and %24IMS-CC-FILEBASE%24/ with the actual path.
+    # The callback inserts base_path literally (no backslash/group expansion).
+    return _IMS_CC_RE.sub(lambda match: base_path + match.group(1), content)
 
 
 def rewrite_internal_links(
@@ -171,6 +197,10 @@ def rewrite_internal_links(
     if not content:
         return ""
     
+    # No Canvas course link anywhere: nothing to rewrite, skip parsing
+    if '/courses/' not in content:
+        return content
+    
     soup = BeautifulSoup(content, 'html.parser')
     
     # Find all links
@@ -178,16 +208,14 @@ def rewrite_internal_links(
         href = link['href']
         
         # Check if it's a Canvas module item link
-        # Format: /courses/{course_id}/modules/items/{item_id}
-        match = re.match(r'/courses/\d+/modules/items/(\w+)', href)
+        match = _MODULE_ITEM_LINK_RE.match(href)
         if match:
             item_id = match.group(1)
             if item_id in link_map:
                 link['href'] = link_map[item_id]
         
         # Check if it's a Canvas page link
-        # Format: /courses/{course_id}/pages/{page_slug}
-        match = re.match(r'/courses/\d+/pages/(\w+)', href)
+        match = _PAGE_LINK_RE.match(href)
         if match:
             page_slug = match.group(1)
             if page_slug in link_map:
@@ -298,11 +326,10 @@ def get_inner_html(element) -> str:
         # Try lxml approach first
         from lxml import etree
         if hasattr(element, 'text'):
-            # Get all inner content
-            inner = element.text or ""
-            for child in element:
-                inner += etree.tostring(child, encoding='unicode', method='html')
-            return inner
+            # Leading text, then every child serialized, joined once
+            parts = [element.text or ""]
+            parts.extend(etree.tostring(child, encoding='unicode', method='html') for child in element)
+            return ''.join(parts)
     except:
         pass
     
@@ -316,6 +343,7 @@ def get_inner_html(element) -> str:
     # Fallback: return text content
     return str(element) if element is not None else ""
 
+
 def get_body_content(html_content: str) -> str:
     """
     Extract the content inside the <body> tag.
@@ -328,9 +356,26 @@ def get_body_content(html_content: str) -> str:
     """
     if not html_content:
         return ""
-        
-    soup = BeautifulSoup(html_content, 'html.parser')
-    if soup.body:
-        return soup.body.decode_contents()
-    return ""
+    
+    # Well-formed documents: slice the body out without parsing anything
+    match = _BODY_RE.search(html_content)
+    if match:
+        return match.group(1)
+    
+    if not _BODY_TAG_RE.search(html_content):
+        return ""
+    
+    # Unclosed <body>: let lxml find where the body content ends
+    try:
+        doc = lxml_html.document_fromstring(html_content.encode('utf-8'), parser=_HTML_PARSER)
+    except etree.LxmlError:
+        return ""
+    body = doc.find('body')
+    if body is None:
+        return ""
+    
+    # Leading text comes back unescaped from lxml; children serialize with their tails
+    parts = [html.escape(body.text, quote=False) if body.text else ""]
+    parts.extend(etree.tostring(child, encoding='unicode', method='html') for child in body)
+    return ''.join(parts)
 
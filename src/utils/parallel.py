@@ -0,0 +1,102 @@
+"""
+Process-pool helpers for parsing many independent files.
+
+Worker functions must be module-level (so they can be pickled) and should
+return their errors alongside the result so the caller can merge them.
+
+Pools never fork: process_map is called from the parse stage's threads (and
+whole pipelines run in threads), and forking a multithreaded process can
+copy locks held by other threads (logging, libxml2) into a child that then
+deadlocks. Workers start from a clean forkserver/spawn process instead.
+
+Starting a pool is expensive: about 200 ms before the first result, since
+every worker re-imports lxml, bleach and the parsers. Callers therefore pass
+a min_items derived from their own per-item cost, and a parse stage shares
+one WorkerPool so that cost is paid at most once per course.
+scripts/benchmark_parallel.py measures both figures on a given export.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Items sent to a worker per round trip (amortizes IPC)
+PARALLEL_CHUNKSIZE = 8
+
+# Start method for pool workers; never 'fork' (see module docstring)
+_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+
+class WorkerPool:
+    """
+    A process pool shared by several process_map calls, started on first use.
+
+    Concurrent callers (e.g. the page and quiz parsers running side by side)
+    submit to the same workers instead of each starting a pool of their own.
+    shutdown() stops the workers; the pool starts again if used afterwards.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        """Return the running executor, starting it if needed."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(mp_context=_MP_CONTEXT)
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the workers, if any were started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+def process_map(
+    func: Callable[..., T],
+    items: Iterable[Any],
+    *args: Any,
+    min_items: int,
+    pool: Optional[WorkerPool] = None
+) -> List[T]:
+    """
+    Call func(*args, item) for every item, using a process pool for large batches.
+
+    Small batches, and calls made from inside a worker process (no nested
+    pools), run serially in the current process. Safe to call from threads
+    because workers are started with forkserver/spawn; it must not be called
+    from threads if the pool is ever switched to the 'fork' start method.
+
+    Args:
+        func: Module-level function to apply
+        items: Items to process
+        *args: Leading arguments passed unchanged to every call
+        min_items: Minimum batch size that uses a process pool; roughly the
+            pool start-up cost divided by the serial cost of one item
+        pool: Shared pool to run on; without one, a pool is started and
+            stopped for this call
+
+    Returns:
+        Results in the same order as items
+    """
+    items = list(items)
+
+    if len(items) < min_items or multiprocessing.parent_process() is not None:
+        return [func(*args, item) for item in items]
+
+    arg_iters = [repeat(arg) for arg in args]
+
+    if pool is not None:
+        return list(pool.executor().map(func, *arg_iters, items, chunksize=PARALLEL_CHUNKSIZE))
+
+    with ProcessPoolExecutor(mp_context=_MP_CONTEXT) as executor:
+        return list(executor.map(func, *arg_iters, items, chunksize=PARALLEL_CHUNKSIZE))
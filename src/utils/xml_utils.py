@@ -5,18 +5,74 @@ This module provides robust XML parsing functions with proper namespace handling
 and error reporting.
 """
 
+import os
+import re
+import threading
+from functools import lru_cache
 from lxml import etree
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from pathlib import Path
 
+# Options for the course XML parsers. Canvas exports never rely on DTDs or
+# external entities, so both are disabled (also closes XXE). xml:id lookups
+# are never used, so the per-document id table is skipped. Whether
+# whitespace-only text is dropped is chosen per call (remove_blank_text).
+_PARSER_OPTIONS = dict(
+    recover=False,
+    resolve_entities=False,
+    load_dtd=False,
+    no_network=True,
+    collect_ids=False,
+    huge_tree=False
+)
 
-def parse_xml_file(file_path: Path, namespaces: Optional[Dict[str, str]] = None) -> Optional[etree._Element]:
+# Parsers per thread (keyed by remove_blank_text): a parser shared across
+# threads serializes their parses
+_parsers = threading.local()
+
+# Distinct (expression, namespaces) pairs kept compiled by find_element(s)
+XPATH_CACHE_SIZE = 256
+
+# Plain child/descendant paths without predicates or functions (./a, .//p:a/p:b).
+# ElementPath find/findall walk the tree directly and stop at the first hit.
+_SIMPLE_PATH_RE = re.compile(r'\.//?[\w-]+(?::[\w-]+)?(?:/[\w-]+(?::[\w-]+)?)*')
+
+# Compiled XSD schemas for validate_xml_schema: resolved path -> (mtime_ns, schema).
+# Per thread, because validating writes the schema's error_log.
+_schema_cache = threading.local()
+
+# Single-tag descendant searches (//tag, .//tag, .//p:tag), answered by find_element
+# with a tag-filtered iterator that stops at the first match
+_SINGLE_TAG_RE = re.compile(r'(\.?)//(?:([\w-]+):)?([\w-]+)')
+
+
+def _get_parser(strip_whitespace: bool = False) -> etree.XMLParser:
+    """Return this thread's course XML parser, creating it on first use."""
+    parsers = getattr(_parsers, 'by_mode', None)
+    if parsers is None:
+        parsers = _parsers.by_mode = {}
+    
+    parser = parsers.get(strip_whitespace)
+    if parser is None:
+        parser = parsers[strip_whitespace] = etree.XMLParser(
+            remove_blank_text=strip_whitespace, **_PARSER_OPTIONS
+        )
+    return parser
+
+
+def parse_xml_file(
+    file_path: Path,
+    namespaces: Optional[Dict[str, str]] = None,
+    strip_whitespace: bool = False
+) -> Optional[etree._Element]:
     """
     Parse an XML file with proper error handling.
     
     Args:
         file_path: Path to XML file
         namespaces: Optional namespace dictionary
+        strip_whitespace: Drop whitespace-only text between elements
+            (costs extra work per text node; off unless needed)
         
     Returns:
         Parsed XML root element or None if parsing fails
@@ -25,12 +81,10 @@ def parse_xml_file(file_path: Path, namespaces: Optional[Dict[str, str]] = None)
         FileNotFoundError: If file doesn't exist
         etree.XMLSyntaxError: If XML is malformed
     """
-    if not file_path.exists():
-        raise FileNotFoundError(f"XML file not found: {file_path}")
-    
     try:
-        parser = etree.XMLParser(remove_blank_text=True, recover=False)
-        tree = etree.parse(str(file_path), parser)
+        # open() raises FileNotFoundError itself; no separate exists() stat
+        with open(file_path, 'rb') as xml_file:
+            tree = etree.parse(xml_file, _get_parser(strip_whitespace), base_url=str(file_path))
         return tree.getroot()
     except etree.XMLSyntaxError as e:
         raise etree.XMLSyntaxError(
@@ -38,26 +92,68 @@ def parse_xml_file(file_path: Path, namespaces: Optional[Dict[str, str]] = None)
         )
 
 
-def parse_xml_string(xml_string: str) -> Optional[etree._Element]:
+def parse_xml_string(
+    xml_string: Union[str, bytes],
+    strip_whitespace: bool = False
+) -> Optional[etree._Element]:
     """
     Parse an XML string.
     
     Args:
-        xml_string: XML content as string
+        xml_string: XML content as string, or as bytes (preferred: parsed
+            without the UTF-8 encoding copy)
+        strip_whitespace: Drop whitespace-only text between elements
         
     Returns:
         Parsed XML root element or None if parsing fails
     """
+    data = xml_string.encode('utf-8') if isinstance(xml_string, str) else xml_string
     try:
-        parser = etree.XMLParser(remove_blank_text=True, recover=False)
-        return etree.fromstring(xml_string.encode('utf-8'), parser)
+        return etree.fromstring(data, _get_parser(strip_whitespace))
     except etree.XMLSyntaxError as e:
         raise etree.XMLSyntaxError(f"Failed to parse XML string: {str(e)}")
 
 
+@lru_cache(maxsize=XPATH_CACHE_SIZE)
+def _compile_xpath(expression: str, namespace_items: Tuple[Tuple[str, str], ...]) -> etree.XPath:
+    """Compile an XPath expression once per (expression, namespaces) pair."""
+    return etree.XPath(expression, namespaces=dict(namespace_items) or None)
+
+
+def _as_xpath(
+    xpath: Union[str, etree.XPath],
+    namespaces: Optional[Dict[str, str]]
+) -> etree.XPath:
+    """Return xpath compiled (from the cache for string expressions)."""
+    if isinstance(xpath, etree.XPath):
+        return xpath
+    return _compile_xpath(xpath, tuple(namespaces.items()) if namespaces else ())
+
+
+def _find_first_tag(
+    root: etree._Element,
+    match: re.Match,
+    namespaces: Optional[Dict[str, str]]
+) -> Optional[etree._Element]:
+    """First element for a _SINGLE_TAG_RE match, in document order."""
+    relative, prefix, local_name = match.groups()
+    if prefix:
+        uri = namespaces.get(prefix) if namespaces else None
+        if uri is None:
+            return None
+        tag = f'{{{uri}}}{local_name}'
+    else:
+        tag = local_name
+    
+    if relative:
+        return next(root.iterdescendants(tag), None)
+    # Absolute //tag searches the whole document, its root element included
+    return next(root.getroottree().iter(tag), None)
+
+
 def find_element(
     root: etree._Element,
-    xpath: str,
+    xpath: Union[str, etree.XPath],
     namespaces: Optional[Dict[str, str]] = None
 ) -> Optional[etree._Element]:
     """
@@ -65,24 +161,37 @@ def find_element(
     
     Args:
         root: Root element to search from
-        xpath: XPath expression
+        xpath: XPath expression (compiled once and cached), or a precompiled
+            etree.XPath (namespaces ignored)
         namespaces: Namespace dictionary
         
     Returns:
         First matching element or None
     """
+    if isinstance(xpath, str):
+        match = _SINGLE_TAG_RE.fullmatch(xpath)
+        if match:
+            return _find_first_tag(root, match, namespaces)
+        if _SIMPLE_PATH_RE.fullmatch(xpath):
+            try:
+                return root.find(xpath, namespaces or None)
+            except SyntaxError:
+                # Prefix missing from namespaces (XPath would fail to evaluate too)
+                return None
+    
     try:
-        result = root.xpath(xpath, namespaces=namespaces or {})
+        result = _as_xpath(xpath, namespaces)(root)
         if result and isinstance(result, list):
             return result[0] if len(result) > 0 else None
         return result if isinstance(result, etree._Element) else None
-    except etree.XPathEvalError:
+    except etree.XPathError:
+        # Invalid expressions (syntax or evaluation) find nothing
         return None
 
 
 def find_elements(
     root: etree._Element,
-    xpath: str,
+    xpath: Union[str, etree.XPath],
     namespaces: Optional[Dict[str, str]] = None
 ) -> List[etree._Element]:
     """
@@ -90,24 +199,32 @@ def find_elements(
     
     Args:
         root: Root element to search from
-        xpath: XPath expression
+        xpath: XPath expression (compiled once and cached), or a precompiled
+            etree.XPath (namespaces ignored)
         namespaces: Namespace dictionary
         
     Returns:
         List of matching elements (empty list if none found)
     """
+    if isinstance(xpath, str) and _SIMPLE_PATH_RE.fullmatch(xpath):
+        try:
+            return root.findall(xpath, namespaces or None)
+        except SyntaxError:
+            return []
+    
     try:
-        result = root.xpath(xpath, namespaces=namespaces or {})
+        result = _as_xpath(xpath, namespaces)(root)
         if isinstance(result, list):
             return [elem for elem in result if isinstance(elem, etree._Element)]
         return []
-    except etree.XPathEvalError:
+    except etree.XPathError:
         return []
 
 
 def get_element_text(
     element: Optional[etree._Element],
-    default: str = ""
+    default: str = "",
+    strip: bool = True
 ) -> str:
     """
     Safely get text content from an element.
@@ -115,6 +232,7 @@ def get_element_text(
     Args:
         element: Element to extract text from
         default: Default value if element is None or has no text
+        strip: Strip surrounding whitespace (skip when callers don't need it)
         
     Returns:
         Element text or default value
@@ -123,7 +241,9 @@ def get_element_text(
         return default
     
     text = element.text
-    return text.strip() if text else default
+    if not text:
+        return default
+    return text.strip() if strip else text
 
 
 def get_element_attribute(
@@ -177,14 +297,13 @@ def get_inner_html(element: etree._Element) -> str:
     Returns:
         Inner HTML as string
     """
-    # Get text before first child
-    html = element.text or ""
+    tostring = etree.tostring
     
-    # Add all children
-    for child in element:
-        html += etree.tostring(child, encoding='unicode', method='html')
+    # Text before first child, then all children, joined once
+    parts = [element.text or ""]
+    parts.extend(tostring(child, encoding='unicode', method='html') for child in element)
     
-    return html.strip()
+    return "".join(parts).strip()
 
 
 def validate_xml_schema(
@@ -202,8 +321,7 @@ def validate_xml_schema(
         Tuple of (is_valid, error_message)
     """
     try:
-        schema_doc = etree.parse(str(schema_file))
-        schema = etree.XMLSchema(schema_doc)
+        schema = _load_schema(schema_file)
         
         xml_doc = etree.parse(str(xml_file))
         
@@ -215,6 +333,24 @@ def validate_xml_schema(
         return False, str(e)
 
 
+def _load_schema(schema_file: Path) -> etree.XMLSchema:
+    """Return the compiled schema for an XSD file, recompiling only when it changes."""
+    cache = getattr(_schema_cache, 'schemas', None)
+    if cache is None:
+        cache = _schema_cache.schemas = {}
+    
+    schema_path = str(schema_file.resolve())
+    mtime_ns = os.stat(schema_path).st_mtime_ns
+    
+    cached = cache.get(schema_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    
+    schema = etree.XMLSchema(etree.parse(schema_path))
+    cache[schema_path] = (mtime_ns, schema)
+    return schema
+
+
 def remove_namespaces(root: etree._Element) -> etree._Element:
     """
     Remove all namespaces from an XML element tree.
@@ -226,12 +362,20 @@ def remove_namespaces(root: etree._Element) -> etree._Element:
     Returns:
         Root element with namespaces removed
     """
-    for elem in root.iter():
+    # Remove schema location hints in one C-level pass
+    etree.strip_attributes(
+        root,
+        '{http://www.w3.org/2001/XMLSchema-instance}schemaLocation'
+    )
+    
+    # Elements only: comments and processing instructions have no namespace
+    for elem in root.iter(etree.Element):
         # Remove namespace from tag
-        if '}' in elem.tag:
-            elem.tag = elem.tag.split('}', 1)[1]
-        
-        # Remove namespace declarations
-        elem.attrib.pop('{http://www.w3.org/2001/XMLSchema-instance}schemaLocation', None)
+        tag = elem.tag
+        if '}' in tag:
+            elem.tag = tag.partition('}')[2]
+    
+    # Drop the now-unused xmlns declarations
+    etree.cleanup_namespaces(root)
     
     return root
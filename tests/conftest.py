@@ -0,0 +1,27 @@
+"""
+Shared pytest fixtures.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Pipeline modules import each other as top-level packages (models, utils, ...)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def canvas_export(tmp_path):
+    """
+    A private copy of the minimal Canvas export, safe to modify.
+
+    It holds one wiki page (wp1) and one assessment resource (q1) that has no
+    href and lists its QTI body only as a <file> entry.
+    """
+    export_dir = tmp_path / "export"
+    shutil.copytree(FIXTURES_DIR / "minimal_export", export_dir)
+    return export_dir
@@ -0,0 +1,81 @@
+"""
+Tests for the copy_file_range path of copy_file_safe and its fallbacks.
+"""
+
+import errno
+import os
+import shutil
+
+import pytest
+
+from utils.file_utils import _fast_copy, copy_file_safe
+
+CONTENT = b"course asset bytes\n" * 64
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.bin"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def test_copy_file_safe_copies_contents(source, tmp_path):
+    destination = tmp_path / "out" / "copy.bin"
+    
+    assert copy_file_safe(source, destination)
+    assert destination.read_bytes() == CONTENT
+
+
+def test_falls_back_without_copy_file_range(source, tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "copy_file_range", raising=False)
+    destination = tmp_path / "copy.bin"
+    
+    _fast_copy(source, destination)
+    
+    assert destination.read_bytes() == CONTENT
+
+
+def test_falls_back_when_unsupported(source, tmp_path, monkeypatch):
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+    
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    destination = tmp_path / "copy.bin"
+    
+    _fast_copy(source, destination)
+    
+    assert destination.read_bytes() == CONTENT
+
+
+def test_falls_back_when_nothing_is_copied(source, tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0, raising=False)
+    destination = tmp_path / "copy.bin"
+    
+    _fast_copy(source, destination)
+    
+    assert destination.read_bytes() == CONTENT
+
+
+def test_raises_when_copy_stops_partway(source, tmp_path, monkeypatch):
+    calls = []
+    
+    def partial(src_fd, dst_fd, count):
+        # First call copies a few bytes, then the source seems exhausted
+        if calls:
+            return 0
+        calls.append(count)
+        return os.write(dst_fd, os.read(src_fd, 10))
+    
+    monkeypatch.setattr(os, "copy_file_range", partial, raising=False)
+    
+    with pytest.raises(OSError):
+        _fast_copy(source, tmp_path / "copy.bin")
+
+
+def test_same_file_is_left_intact(source):
+    with pytest.raises(shutil.SameFileError):
+        _fast_copy(source, source)
+    
+    assert not copy_file_safe(source, source, overwrite=True)
+    assert source.read_bytes() == CONTENT
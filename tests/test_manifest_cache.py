@@ -0,0 +1,52 @@
+"""
+Tests for the opt-in parsed-manifest cache (MANIFEST_CACHE_DIR).
+"""
+
+import json
+from dataclasses import asdict
+
+import parsers.manifest_parser as manifest_parser
+from parsers.manifest_parser import ManifestParser, MANIFEST_CACHE_ENV
+
+
+def _fail_parse(*args, **kwargs):
+    raise AssertionError("manifest was parsed instead of read from the cache")
+
+
+def test_cache_is_json_and_rechecks_resource_files(canvas_export, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv(MANIFEST_CACHE_ENV, str(cache_dir))
+
+    fresh_parser = ManifestParser(canvas_export)
+    fresh = fresh_parser.parse()
+    assert fresh.resources["wp1"].file_exists
+
+    cache_files = list(cache_dir.glob("*.json"))
+    assert len(cache_files) == 1
+    json.loads(cache_files[0].read_text(encoding="utf-8"))
+
+    # The manifest is unchanged, but a course file disappears
+    (canvas_export / "wiki_content" / "page-one.html").unlink()
+    monkeypatch.setattr(manifest_parser, "parse_xml_file", _fail_parse)
+
+    cached_parser = ManifestParser(canvas_export)
+    cached = cached_parser.parse()
+
+    assert cached.resources["wp1"].file_exists is False
+    assert cached.resources["wp1"].resolved_path is None
+    assert [asdict(m) for m in cached.modules] == [asdict(m) for m in fresh.modules]
+    assert cached_parser.referenced_files == fresh_parser.referenced_files
+
+
+def test_unreadable_cache_falls_back_to_parsing(canvas_export, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv(MANIFEST_CACHE_ENV, str(cache_dir))
+
+    ManifestParser(canvas_export).parse()
+    cache_file = next(cache_dir.glob("*.json"))
+    cache_file.write_bytes(b"\x80\x04not json")
+
+    course = ManifestParser(canvas_export).parse()
+
+    assert course is not None
+    assert course.resources["wp1"].file_exists
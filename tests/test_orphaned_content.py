@@ -0,0 +1,61 @@
+"""
+Tests that the Validator's orphan list and the Parser's orphan recovery agree.
+"""
+
+import pytest
+
+from core.stages.parser import Parser
+from core.stages.validator import Validator
+
+
+def _parse_pages(course_directory, pipeline):
+    if pipeline:
+        validator = Validator(course_directory)
+        report = validator.validate()
+        parser = Parser(
+            course_directory,
+            manifest_root=validator.manifest_root,
+            inventory=frozenset(report.inventory.all_files),
+            orphaned_files=report.inventory.orphaned_files
+        )
+    else:
+        parser = Parser(course_directory)
+    
+    course, _ = parser.parse()
+    return sorted(page.title for page in course.pages)
+
+
+@pytest.mark.parametrize("pipeline", [True, False], ids=["pipeline", "standalone"])
+def test_stray_html_is_recovered_as_orphan(canvas_export, pipeline):
+    (canvas_export / "stray.html").write_text(
+        "<html><head><title>Stray</title></head><body><p>Orphan content</p></body></html>",
+        encoding="utf-8"
+    )
+    
+    assert _parse_pages(canvas_export, pipeline) == ["Page One", "Stray"]
+
+
+@pytest.mark.parametrize("pipeline", [True, False], ids=["pipeline", "standalone"])
+def test_file_only_references_are_not_orphans(canvas_export, pipeline):
+    # q1/assessment_qti.xml is referenced only by a <file> entry
+    assert _parse_pages(canvas_export, pipeline) == ["Page One"]
+
+
+def test_validator_orphan_list_skips_file_references(canvas_export):
+    (canvas_export / "stray.html").write_text("<p>Orphan content</p>", encoding="utf-8")
+    
+    report = Validator(canvas_export).validate()
+    
+    assert report.inventory.orphaned_files == ["stray.html"]
+
+
+@pytest.mark.parametrize("pipeline", [True, False], ids=["pipeline", "standalone"])
+def test_system_files_are_not_orphans(canvas_export, pipeline):
+    # syllabus.html is a system file despite not being XML
+    (canvas_export / "course_settings").mkdir()
+    (canvas_export / "course_settings" / "syllabus.html").write_text(
+        "<html><head><title>Syllabus</title></head><body><p>Week 1</p></body></html>",
+        encoding="utf-8"
+    )
+    
+    assert _parse_pages(canvas_export, pipeline) == ["Page One"]
@@ -0,0 +1,27 @@
+"""
+Tests for the shared worker pool in utils.parallel.
+"""
+
+from utils.parallel import WorkerPool, process_map
+
+
+def test_small_batches_never_start_the_pool():
+    pool = WorkerPool()
+    
+    assert process_map(abs, [-1, -2], min_items=3, pool=pool) == [1, 2]
+    assert pool._executor is None
+
+
+def test_pool_is_shared_and_restarts_after_shutdown():
+    pool = WorkerPool()
+    try:
+        assert process_map(divmod, [3, 7, 9], 10, min_items=1, pool=pool) == [(3, 1), (1, 3), (1, 1)]
+        executor = pool.executor()
+        assert process_map(abs, [-4, 5], min_items=1, pool=pool) == [4, 5]
+        assert pool.executor() is executor
+        
+        pool.shutdown()
+        assert pool._executor is None
+        assert process_map(abs, [-6], min_items=1, pool=pool) == [6]
+    finally:
+        pool.shutdown()